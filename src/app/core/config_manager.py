@@ -38,3 +38,7 @@ class ConfigManager:
     def get_line_crossing_config(self) -> Dict[str, Any]:
         """Get line crossing configuration."""
         return self.config.get("line_crossing", {})
+
+    def get_display_config(self) -> Dict[str, Any]:
+        """Get display configuration."""
+        return self.config.get("display", {})
@@ -1,5 +1,6 @@
 from typing import Any, Dict, Optional, Tuple
 
+import cv2
 import numpy as np
 
 from app.utils.coordinate_utils import CoordinateTransformer
@@ -17,12 +18,18 @@ class LineManager:
         self.cached_drawing_info: Optional[Dict[str, Any]] = None
         self.last_canvas_size = (0, 0)
         self._finalized_for_processing = False
+        self._state_version = 0
 
     @property
     def is_drawing(self) -> bool:
         """Property to check if currently drawing."""
         return self.drawing_line
 
+    @property
+    def state_version(self) -> int:
+        """Counter bumped whenever the line or side selection changes."""
+        return self._state_version
+
     def start_drawing(
         self,
         canvas_x: int = None,
@@ -49,6 +56,7 @@ class LineManager:
             self.line_start = None
             self.line_end = None
             self.cached_drawing_info = None
+            self._state_version += 1
 
     def start_line(
         self, canvas_x: int, canvas_y: int, canvas_width: int, canvas_height: int
@@ -78,6 +86,7 @@ class LineManager:
         )
         self.line_start = (frame_x, frame_y)
         self.line_end = (frame_x, frame_y)
+        self._state_version += 1
 
     def update_line_end(
         self, canvas_x: int, canvas_y: int, canvas_width: int, canvas_height: int
@@ -89,6 +98,7 @@ class LineManager:
             )
             self.line_end = (frame_x, frame_y)
             self.cached_drawing_info = None  # Invalidate cache
+            self._state_version += 1
 
     def finish_drawing(self):
         """Finish drawing the line."""
@@ -96,10 +106,12 @@ class LineManager:
         self.cached_drawing_info = (
             None  # Invalidate cache to recalculate with label positions
         )
+        self._state_version += 1
 
     def select_side(self, side: str):
         """Select which side is the IN side."""
         self.selected_side = side
+        self._state_version += 1
 
     def set_side_selection(self, side: str):
         """Set which side is the IN side (alias for select_side)."""
@@ -108,6 +120,7 @@ class LineManager:
     def clear_side_selection(self):
         """Clear the side selection."""
         self.selected_side = None
+        self._state_version += 1
 
     def get_side_selection(self) -> Optional[str]:
         """Get the currently selected side."""
@@ -229,17 +242,15 @@ class LineManager:
 
     def _calculate_mask_centroid(self, mask):
         """Calculate the centroid (center of mass) of a mask."""
-        import numpy as np
-
-        # Find all non-zero pixels in the mask
-        y_coords, x_coords = np.where(mask > 0)
+        # Spatial moments of the non-zero pixels, computed in a single pass
+        moments = cv2.moments(mask.astype(np.uint8, copy=False), binaryImage=True)
 
-        if len(x_coords) == 0 or len(y_coords) == 0:
+        if moments["m00"] == 0:
             return None
 
         # Calculate centroid
-        centroid_x = int(np.mean(x_coords))
-        centroid_y = int(np.mean(y_coords))
+        centroid_x = int(moments["m10"] / moments["m00"])
+        centroid_y = int(moments["m01"] / moments["m00"])
 
         return (centroid_x, centroid_y)
 
@@ -252,6 +263,7 @@ class LineManager:
             )
             # Mark as finalized so get_drawing_info won't recalculate
             self._finalized_for_processing = True
+            self._state_version += 1
 
     def get_drawing_info(
         self, canvas_width: int, canvas_height: int
@@ -279,22 +291,33 @@ class LineManager:
         return self.cached_drawing_info
 
     def create_side_mask(
-        self, side: str, frame_width: int, frame_height: int
+        self,
+        side: str,
+        frame_width: int,
+        frame_height: int,
+        mask_size: Optional[Tuple[int, int]] = None,
     ) -> np.ndarray:
-        """Create a mask for side highlighting."""
+        """Create a mask for side highlighting.
+
+        The line is given in frame coordinates; pass mask_size (width, height)
+        to render the mask at a different resolution, e.g. the preview size.
+        """
+        mask_width, mask_height = mask_size or (frame_width, frame_height)
         if not self.has_line():
-            return np.zeros((frame_height, frame_width), dtype=np.uint8)
+            return np.zeros((mask_height, mask_width), dtype=np.uint8)
 
-        mask = np.zeros((frame_height, frame_width), dtype=np.uint8)
+        mask = np.zeros((mask_height, mask_width), dtype=np.uint8)
 
         # Get line points
         if self.line_start[1] > self.line_end[1]:
             self.line_start, self.line_end = self.line_end, self.line_start
-        p1x, p1y = self.line_start
-        p2x, p2y = self.line_end
+        scale_x = mask_width / frame_width
+        scale_y = mask_height / frame_height
+        p1x, p1y = self.line_start[0] * scale_x, self.line_start[1] * scale_y
+        p2x, p2y = self.line_end[0] * scale_x, self.line_end[1] * scale_y
 
         # Create grid of coordinates
-        y_coords, x_coords = np.ogrid[:frame_height, :frame_width]
+        y_coords, x_coords = np.ogrid[:mask_height, :mask_width]
 
         # Calculate side of points relative to line P1->P2
         val_matrix = (p2x - p1x) * (y_coords - p1y) - (p2y - p1y) * (x_coords - p1x)
@@ -316,3 +339,4 @@ class LineManager:
         self.last_canvas_size = (0, 0)
         # Reset finalization flag
         self._finalized_for_processing = False
+        self._state_version += 1
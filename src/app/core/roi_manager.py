@@ -107,16 +107,28 @@ class ROIManager:
         """Get ROI points in frame coordinates."""
         return self.roi_points.copy()
 
-    def create_roi_mask(self, frame_width: int, frame_height: int) -> np.ndarray:
-        """Create a binary mask for the ROI region."""
+    def create_roi_mask(
+        self,
+        frame_width: int,
+        frame_height: int,
+        mask_size: Optional[Tuple[int, int]] = None,
+    ) -> np.ndarray:
+        """Create a binary mask for the ROI region.
+
+        The ROI is given in frame coordinates; pass mask_size (width, height)
+        to render the mask at a different resolution, e.g. the preview size.
+        """
+        mask_width, mask_height = mask_size or (frame_width, frame_height)
         if not self.has_roi():
-            return np.zeros((frame_height, frame_width), dtype=np.uint8)
+            return np.zeros((mask_height, mask_width), dtype=np.uint8)
 
         # Create mask
-        mask = np.zeros((frame_height, frame_width), dtype=np.uint8)
+        mask = np.zeros((mask_height, mask_width), dtype=np.uint8)
 
-        # Convert points to numpy array
-        points = np.array(self.roi_points, dtype=np.int32)
+        # Convert points to numpy array, scaled to the mask resolution
+        points = np.array(self.roi_points, dtype=np.float64)
+        points *= (mask_width / frame_width, mask_height / frame_height)
+        points = np.round(points).astype(np.int32)
 
         # Fill the polygon
         cv2.fillPoly(mask, [points], 255)
@@ -149,12 +161,11 @@ class ROIManager:
         )
 
         # Transform ROI points to canvas coordinates
-        canvas_points = []
-        for frame_x, frame_y in self.roi_points:
-            canvas_x, canvas_y = self.coord_transformer.frame_to_canvas(
-                frame_x, frame_y, canvas_width, canvas_height
-            )
-            canvas_points.append((canvas_x, canvas_y))
+        frame_xs, frame_ys = zip(*self.roi_points)
+        canvas_xs, canvas_ys = self.coord_transformer.frame_to_canvas_batch(
+            frame_xs, frame_ys, canvas_width, canvas_height
+        )
+        canvas_points = list(zip(canvas_xs.tolist(), canvas_ys.tolist()))
 
         return {
             "preview_width": preview_width,
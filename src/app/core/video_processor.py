@@ -162,8 +162,15 @@ class VideoProcessor:
         """Stop video processing."""
         self.is_running = False
 
-    def process_next_frame(self) -> Optional[np.ndarray]:
-        """Process the next frame and return the processed frame."""
+    def process_next_frame(
+        self, counting_line: Optional[tuple] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Process the next frame and return the processed frame.
+
+        The counting line, if given, is drawn before the frame goes to the
+        frame callback, which may render it later.
+        """
         if not (self.cap and self.cap.isOpened() and self.is_running):
             return None
 
@@ -197,14 +204,20 @@ class VideoProcessor:
             if self.count_callback:
                 self.count_callback(self.count, self.current_frame_number)
 
-        # Draw bounding boxes and IDs
-        for obj in tracked_objects:
-            bbox = obj["bbox"]
-
-            # Apply ROI filtering for display if enabled
-            if self._bbox_intersects_roi(bbox):
-                x1, y1, x2, y2 = map(int, bbox)
-                cv2.rectangle(frame_rgb, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        # Draw bounding boxes and IDs, applying ROI filtering for display if
+        # enabled
+        visible_objects = [
+            obj for obj in tracked_objects if self._bbox_intersects_roi(obj["bbox"])
+        ]
+        if visible_objects:
+            # All boxes go to OpenCV as one array of corner points, so they
+            # are drawn in a single call
+            boxes = np.asarray([obj["bbox"] for obj in visible_objects])
+            boxes = boxes.astype(np.int32)
+            corners = boxes[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+            cv2.polylines(frame_rgb, corners, True, (0, 255, 0), 2)
+
+            for obj, (x1, y1, _, _) in zip(visible_objects, boxes.tolist()):
                 cv2.putText(
                     frame_rgb,
                     f"ID: {obj['track_id']}",
@@ -215,6 +228,9 @@ class VideoProcessor:
                     2,
                 )
 
+        if counting_line:
+            self.draw_counting_line(frame_rgb, counting_line)
+
         self.current_frame_number += 1
 
         if self.frame_callback:
@@ -80,7 +80,13 @@ class PeopleCounterApp(QMainWindow):
         main_layout.addWidget(splitter)
 
         # Create video display widget with both managers
-        self.video_display = VideoDisplayWidget(self.line_manager, self.roi_manager)
+        self.video_display = VideoDisplayWidget(
+            self.line_manager,
+            self.roi_manager,
+            use_cuda=self.config_manager.get_display_config().get(
+                "use_cuda_preview", False
+            ),
+        )
         # Always start in line mode
         self.video_display.set_drawing_mode("line")
         video_frame = QFrame()
@@ -398,13 +404,10 @@ class PeopleCounterApp(QMainWindow):
             self.processing_timer.stop()
             return
 
-        frame = self.video_processor.process_next_frame()
-        if frame is not None:
-            # Draw counting line on frame
-            counting_line = self.line_manager.get_counting_line()
-            if counting_line:
-                frame = self.video_processor.draw_counting_line(frame, counting_line)
-        else:
+        frame = self.video_processor.process_next_frame(
+            self.line_manager.get_counting_line()
+        )
+        if frame is None:
             # Video processing completed
             self.is_processing = False
             self.processing_timer.stop()
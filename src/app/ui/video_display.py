@@ -1,16 +1,54 @@
-from typing import Any, Callable, Dict, Optional
+from functools import partial
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
 
 import cv2
 import numpy as np
 from loguru import logger
-from PyQt5.QtCore import QPoint, Qt, pyqtSignal
-from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen, QPixmap, QPolygon
+from PyQt5.QtCore import QLine, QPoint, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import (
+    QBrush,
+    QColor,
+    QFont,
+    QFontMetrics,
+    QImage,
+    QPainter,
+    QPainterPath,
+    QPen,
+    QPixmap,
+    QPolygon,
+)
 from PyQt5.QtWidgets import QLabel, QVBoxLayout, QWidget
 
 from app.core.line_manager import LineManager
 from app.core.roi_manager import ROIManager
 
 
+class _PreviewDims(NamedTuple):
+    """Cached preview size and centering offsets within the video label."""
+
+    new_width: int
+    new_height: int
+    offset_x: int
+    offset_y: int
+    interpolation: int  # cv2 interpolation flag for the frame -> preview resize
+
+
+class _FrameOverlay(NamedTuple):
+    """Colored mask highlight blended over the preview at widget resolution."""
+
+    create_mask: Callable[..., np.ndarray]  # called with mask_size=(width, height)
+    color: Tuple[int, int, int]
+    alpha: float
+
+
+class _LineOverlay(NamedTuple):
+    """Counting line and IN/OUT label positions in widget coordinates."""
+
+    line: QLine
+    in_pos: Optional[QPoint]  # None until the line is finished and a side chosen
+    out_pos: Optional[QPoint]
+
+
 class VideoDisplayWidget(QWidget):
     """Widget for displaying video frames and handling line drawing and ROI drawing."""
 
@@ -18,7 +56,12 @@ class VideoDisplayWidget(QWidget):
     line_finished = pyqtSignal()
     roi_finished = pyqtSignal()
 
-    def __init__(self, line_manager: LineManager, roi_manager: ROIManager = None):
+    def __init__(
+        self,
+        line_manager: LineManager,
+        roi_manager: ROIManager = None,
+        use_cuda: bool = False,
+    ):
         super().__init__()
 
         self.line_manager = line_manager
@@ -29,13 +72,58 @@ class VideoDisplayWidget(QWidget):
         self.original_frame: Optional[np.ndarray] = None
 
         # Cached preview dimensions for optimization
-        self.cached_preview_dims: Optional[Dict[str, int]] = None
+        self.cached_preview_dims: Optional[_PreviewDims] = None
         self.last_widget_size = (0, 0)
         self.last_frame_size = (0, 0)
 
         # Pre-allocated objects for performance
         self.display_pixmap: Optional[QPixmap] = None
         self.base_qimage: Optional[QImage] = None
+        # Resized frame (plus highlight), None when it must be rebuilt
+        self.frame_pixmap: Optional[QPixmap] = None
+        self.widget_buffer: Optional[np.ndarray] = None
+        self.preview_view: Optional[np.ndarray] = None
+
+        # Line overlay geometry, rebuilt only when the line or widget size changes
+        self.line_overlay: Optional[_LineOverlay] = None
+        self.line_overlay_key: Optional[Tuple[int, int, int]] = None
+
+        # Highlight overlay for the current frame, blended after resizing
+        self.frame_overlay: Optional[_FrameOverlay] = None
+        self.overlay_image: Optional[np.ndarray] = None
+
+        # Set while a deferred preview update is queued; newer frames replace
+        # current_frame so only the latest one is resized and shown
+        self.preview_update_pending = False
+
+        # Redraws while dragging a line are throttled to ~60 Hz; mouse moves
+        # that report the same position as the last one are ignored
+        self.drag_update_timer = QTimer(self)
+        self.drag_update_timer.setSingleShot(True)
+        self.drag_update_timer.setInterval(16)
+        self.drag_update_timer.timeout.connect(self.update_preview)
+        self.last_mouse_pos: Optional[Tuple[int, int]] = None
+
+        # Counting line and IN/OUT label styles, built once rather than on
+        # every repaint
+        self.line_pen = QPen(QColor(255, 0, 0), 2)
+        self.label_font = QFont("Arial", 16, QFont.Bold)
+        self.label_font_metrics = QFontMetrics(self.label_font)
+        self.label_outline_pen = QPen(QColor(255, 255, 255), 2)
+        self.in_label_brush = QBrush(QColor(0, 255, 0))
+        self.out_label_brush = QBrush(QColor(255, 0, 0))
+
+        # Probe once whether RGB888 images can be blitted without conversion
+        self.pixmap_conversion_flags = self._probe_pixmap_conversion_flags()
+
+        # Optional GPU resize; each distinct frame is uploaded once and only the
+        # resized preview is downloaded
+        self.cuda_stream = None
+        self.gpu_frame = None
+        self.gpu_preview = None
+        self.gpu_frame_source: Optional[np.ndarray] = None
+        if use_cuda:
+            self._init_cuda()
 
         # Drawing state
         self.is_drawing = False
@@ -100,10 +188,32 @@ class VideoDisplayWidget(QWidget):
         self.roi_finish_callback = roi_finish_callback
 
     def update_frame(self, frame: np.ndarray, is_original: bool = False):
-        """Update the displayed frame."""
+        """
+        Update the displayed frame.
+
+        Rendering is deferred to the event loop, so the caller must not modify
+        a playback frame after handing it over; only the original frame, kept
+        for redrawing, is copied.
+        """
         self.current_frame = frame
+        self.frame_overlay = None
+        self.frame_pixmap = None
         if is_original:
+            # The widget never writes to it, which the read-only flag enforces
             self.original_frame = frame.copy()
+            self.original_frame.flags.writeable = False
+            self.current_frame = self.original_frame
+        self.schedule_preview_update()
+
+    def schedule_preview_update(self):
+        """Queue a preview update, coalescing frames and resizes before it runs."""
+        if not self.preview_update_pending:
+            self.preview_update_pending = True
+            QTimer.singleShot(0, self._run_pending_preview_update)
+
+    def _run_pending_preview_update(self):
+        """Render the most recent frame queued by schedule_preview_update."""
+        self.preview_update_pending = False
         self.update_preview()
 
     def update_preview(self):
@@ -148,50 +258,84 @@ class VideoDisplayWidget(QWidget):
                 new_width = widget_width
                 new_height = int(widget_width / aspect_ratio)
 
+            offset_x = (widget_width - new_width) // 2
+            offset_y = (widget_height - new_height) // 2
+
             # Cache the calculated dimensions
-            self.cached_preview_dims = {
-                "new_width": new_width,
-                "new_height": new_height,
-                "offset_x": (widget_width - new_width) // 2,
-                "offset_y": (widget_height - new_height) // 2,
-            }
+            self.cached_preview_dims = _PreviewDims(
+                new_width=new_width,
+                new_height=new_height,
+                offset_x=offset_x,
+                offset_y=offset_y,
+                interpolation=(
+                    cv2.INTER_AREA if new_width < frame_width else cv2.INTER_LINEAR
+                ),
+            )
 
             # Pre-allocate display pixmap only when size changes
             self.display_pixmap = QPixmap(widget_width, widget_height)
 
+            # Widget-sized frame buffer; the black borders around the centered
+            # preview are written once here and never touched again. It is kept
+            # on self because the QImage below borrows its memory. Rows are
+            # padded to 32 bytes so every scanline starts on a SIMD boundary
+            bytes_per_line = (widget_width * 3 + 31) // 32 * 32
+            self.widget_buffer = np.zeros(
+                (widget_height, bytes_per_line), dtype=np.uint8
+            )
+            widget_pixels = self.widget_buffer[:, : widget_width * 3].reshape(
+                widget_height, widget_width, 3
+            )
+            self.preview_view = widget_pixels[
+                offset_y : offset_y + new_height, offset_x : offset_x + new_width
+            ]
+
+            # Wrap the buffer once; later frames are resized into the same
+            # memory, so the QImage always sees the current pixels without a copy
+            self.base_qimage = QImage(
+                memoryview(self.widget_buffer).cast("B"),
+                widget_width,
+                widget_height,
+                bytes_per_line,
+                QImage.Format_RGB888,
+            )
+
             self.last_widget_size = current_widget_size
             self.last_frame_size = current_frame_size
+            self.line_overlay_key = None
+            self.frame_pixmap = None
 
         dims = self.cached_preview_dims
 
-        # Resize frame using cached dimensions
-        resized_frame = cv2.resize(
-            self.current_frame, (dims["new_width"], dims["new_height"])
-        )
-
-        # Fast numpy to QImage conversion without extra copies
-        height, width, channel = resized_frame.shape
-        bytes_per_line = 3 * width
+        # Only resize when the frame itself changed, not for overlay-only
+        # repaints such as mouse moves while drawing the line
+        if self.frame_pixmap is None:
+            if self.cuda_stream is not None:
+                self._resize_frame_cuda(dims)
+            else:
+                # Resize frame straight into the centered region of the widget buffer
+                cv2.resize(
+                    self.current_frame,
+                    (dims.new_width, dims.new_height),
+                    dst=self.preview_view,
+                    interpolation=dims.interpolation,
+                )
+            if self.frame_overlay is not None:
+                self._blend_frame_overlay(dims.new_width, dims.new_height)
 
-        # Create QImage directly from numpy data
-        # Frames from video processor are already in RGB format, no conversion needed
-        if resized_frame.flags["C_CONTIGUOUS"]:
-            q_image = QImage(
-                resized_frame.data, width, height, bytes_per_line, QImage.Format_RGB888
-            )
-        else:
-            # Fall back to previous method if not contiguous
-            q_image = QImage(
-                resized_frame.data, width, height, bytes_per_line, QImage.Format_RGB888
+            # Frames from video processor are already in RGB format
+            self.frame_pixmap = QPixmap.fromImage(
+                self.base_qimage, self.pixmap_conversion_flags
             )
 
         # Check if we need overlays
-        line_drawing_info = self.line_manager.get_drawing_info(
-            widget_width, widget_height
-        )
-        has_line_overlay = line_drawing_info and line_drawing_info.get(
-            "has_line", False
-        )
+        line_info_key = (self.line_manager.state_version, widget_width, widget_height)
+        if line_info_key != self.line_overlay_key:
+            self.line_overlay = self._build_line_overlay(
+                self.line_manager.get_drawing_info(widget_width, widget_height)
+            )
+            self.line_overlay_key = line_info_key
+        has_line_overlay = self.line_overlay is not None
 
         roi_drawing_info = None
         has_roi_overlay = False
@@ -205,15 +349,14 @@ class VideoDisplayWidget(QWidget):
 
         if has_line_overlay or has_roi_overlay:
             # Only use QPainter when we need to draw overlays
-            self.display_pixmap.fill(Qt.black)
             painter = QPainter(self.display_pixmap)
 
-            # Draw the video frame
-            painter.drawImage(dims["offset_x"], dims["offset_y"], q_image)
+            # Draw the video frame (already centered within the buffer)
+            painter.drawPixmap(0, 0, self.frame_pixmap)
 
             # Draw line overlay if present
             if has_line_overlay:
-                self._draw_line_overlay(painter, line_drawing_info)
+                self._draw_line_overlay(painter, self.line_overlay)
 
             # Draw ROI overlay if present
             if has_roi_overlay:
@@ -222,136 +365,188 @@ class VideoDisplayWidget(QWidget):
             painter.end()
             self.video_label.setPixmap(self.display_pixmap)
         else:
-            # Direct pixmap creation without QPainter for better performance
-            frame_pixmap = QPixmap.fromImage(q_image)
-
-            if dims["offset_x"] == 0 and dims["offset_y"] == 0:
-                # No centering needed, use frame directly
-                self.video_label.setPixmap(frame_pixmap)
-            else:
-                # Need centering
-                self.display_pixmap.fill(Qt.black)
-                painter = QPainter(self.display_pixmap)
-                painter.drawPixmap(dims["offset_x"], dims["offset_y"], frame_pixmap)
-                painter.end()
-                self.video_label.setPixmap(self.display_pixmap)
-
-    def _draw_line_overlay(self, painter: QPainter, drawing_info: Dict[str, Any]):
-        """Draw line overlay using cached info."""
-        if not drawing_info.get("has_line", False):
+            # Show the frame pixmap directly without QPainter
+            self.video_label.setPixmap(self.frame_pixmap)
+
+    def _init_cuda(self):
+        """Enable the cv2.cuda resize path if a CUDA device is available."""
+        try:
+            device_count = cv2.cuda.getCudaEnabledDeviceCount()
+        except (AttributeError, cv2.error):
+            device_count = 0
+
+        if device_count == 0:
+            logger.warning("CUDA preview requested but no CUDA device found, using CPU")
             return
 
-        # Set up painter for line drawing
-        pen = QPen(QColor(255, 0, 0), 2)
-        painter.setPen(pen)
-
-        # Draw extended line using cached coordinates
-        ext_start_x, ext_start_y, ext_end_x, ext_end_y = drawing_info["line_coords"]
-        painter.drawLine(
-            int(ext_start_x), int(ext_start_y), int(ext_end_x), int(ext_end_y)
+        self.cuda_stream = cv2.cuda.Stream()
+        self.gpu_frame = cv2.cuda_GpuMat()
+        self.gpu_preview = cv2.cuda_GpuMat()
+        logger.info("Video display using CUDA for preview resizing")
+
+    def _resize_frame_cuda(self, dims: _PreviewDims):
+        """Resize the current frame on the GPU into the preview buffer."""
+        # Upload only when the frame changed, not when the widget was resized
+        if self.gpu_frame_source is not self.current_frame:
+            self.gpu_frame.upload(self.current_frame, self.cuda_stream)
+            self.gpu_frame_source = self.current_frame
+
+        cv2.cuda.resize(
+            self.gpu_frame,
+            (dims.new_width, dims.new_height),
+            dst=self.gpu_preview,
+            interpolation=dims.interpolation,
+            stream=self.cuda_stream,
         )
+        resized = self.gpu_preview.download(self.cuda_stream)
+        self.cuda_stream.waitForCompletion()
+        np.copyto(self.preview_view, resized)
+
+    @staticmethod
+    def _probe_pixmap_conversion_flags() -> Qt.ImageConversionFlags:
+        """Return NoFormatConversion if the platform can hold RGB888 pixmaps as-is."""
+        probe = QImage(1, 1, QImage.Format_RGB888)
+        probe.fill(Qt.black)
+        if not QPixmap.fromImage(probe, Qt.NoFormatConversion).isNull():
+            return Qt.NoFormatConversion
+        logger.info("RGB888 pixmaps not supported natively, using format conversion")
+        return Qt.AutoColor
+
+    def _build_line_overlay(
+        self, drawing_info: Optional[Dict[str, Any]]
+    ) -> Optional[_LineOverlay]:
+        """Turn the line manager's drawing info into ready-to-paint Qt objects."""
+        if not drawing_info or not drawing_info.get("has_line", False):
+            return None
 
-        # Draw labels if side is selected
-        if self.line_manager.selected_side is not None:
-            self._draw_labels_cached(painter, drawing_info)
+        line = QLine(*drawing_info["line_coords"])
 
-    def _draw_labels_cached(self, painter: QPainter, drawing_info: Dict[str, Any]):
-        """Draw IN/OUT labels using cached information."""
-        # Get the pre-calculated label positions from drawing info
+        # Labels only once the line is finished and a side is selected
         label_positions = drawing_info.get("label_positions")
-        if not label_positions:
-            # No label positions available (likely still drawing the line)
-            return
-
-        left_pos = label_positions["left_pos"]
-        right_pos = label_positions["right_pos"]
+        selected_side = self.line_manager.selected_side
+        if not label_positions or selected_side is None:
+            return _LineOverlay(line, None, None)
 
-        # Set up font
-        font = QFont("Arial", 16, QFont.Bold)
-        painter.setFont(font)
+        left_pos = QPoint(*label_positions["left_pos"])
+        right_pos = QPoint(*label_positions["right_pos"])
 
         # Determine which side should be IN based on user selection
-        if self.line_manager.selected_side == "left":
-            in_pos = left_pos
-            out_pos = right_pos
-        else:  # right side
-            in_pos = right_pos
-            out_pos = left_pos
+        if selected_side == "left":
+            return _LineOverlay(line, left_pos, right_pos)
+        return _LineOverlay(line, right_pos, left_pos)
+
+    def _draw_line_overlay(self, painter: QPainter, line_overlay: _LineOverlay):
+        """Draw line overlay using cached geometry."""
+        # Set up painter for line drawing
+        painter.setPen(self.line_pen)
+
+        # Draw extended line
+        painter.drawLine(line_overlay.line)
+
+        # Draw labels if side is selected
+        if line_overlay.in_pos is not None:
+            self._draw_labels_cached(painter, line_overlay)
 
+    def _draw_labels_cached(self, painter: QPainter, line_overlay: _LineOverlay):
+        """Draw IN/OUT labels at their cached positions."""
         # Draw IN label with background for better visibility
         self._draw_text_with_outline(
-            painter, int(in_pos[0]), int(in_pos[1]), "IN", QColor(0, 255, 0)
+            painter, line_overlay.in_pos, "IN", self.in_label_brush
         )
 
         # Draw OUT label with background for better visibility
         self._draw_text_with_outline(
-            painter, int(out_pos[0]), int(out_pos[1]), "OUT", QColor(255, 0, 0)
+            painter, line_overlay.out_pos, "OUT", self.out_label_brush
         )
 
     def _calculate_mask_centroid(self, mask):
         """Calculate the centroid (center of mass) of a mask."""
-        import numpy as np
-
-        # Find all non-zero pixels in the mask
-        y_coords, x_coords = np.where(mask > 0)
+        # Spatial moments of the non-zero pixels, computed in a single pass
+        moments = cv2.moments(mask.astype(np.uint8, copy=False), binaryImage=True)
 
-        if len(x_coords) == 0 or len(y_coords) == 0:
+        if moments["m00"] == 0:
             return None
 
         # Calculate centroid
-        centroid_x = int(np.mean(x_coords))
-        centroid_y = int(np.mean(y_coords))
+        centroid_x = int(moments["m10"] / moments["m00"])
+        centroid_y = int(moments["m01"] / moments["m00"])
 
         return (centroid_x, centroid_y)
 
-    def _draw_text_with_outline(self, painter, x, y, text, color):
+    def _draw_text_with_outline(self, painter, pos, text, brush):
         """Draw text with a white outline for better visibility."""
         # Get font metrics for proper text centering
-        font_metrics = painter.fontMetrics()
-        text_width = font_metrics.width(text)
-        text_height = font_metrics.height()
-
-        # Center the text at the given position
-        centered_x = x - text_width // 2
-        centered_y = y + text_height // 4  # Slight adjustment for visual centering
+        text_width = self.label_font_metrics.width(text)
+        text_height = self.label_font_metrics.height()
+
+        # Center the text at the given position, with a slight vertical
+        # adjustment for visual centering
+        centered_x = pos.x() - text_width // 2
+        centered_y = pos.y() + text_height // 4
+
+        # Lay the glyphs out once, then stroke the white outline and fill the
+        # colored text from the same path
+        path = QPainterPath()
+        path.addText(centered_x, centered_y, self.label_font, text)
+
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.strokePath(path, self.label_outline_pen)
+        painter.fillPath(path, brush)
+        painter.setRenderHint(QPainter.Antialiasing, False)
+
+    def _set_frame_overlay(self, overlay: Optional[_FrameOverlay]):
+        """Set the highlight overlay for the current frame and redraw."""
+        self.frame_overlay = overlay
+        self.overlay_image = None
+        self.frame_pixmap = None
+        self.update_preview()
 
-        # Draw white outline by drawing text multiple times with offsets
-        painter.setPen(QPen(QColor(255, 255, 255), 2))
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx != 0 or dy != 0:  # Don't draw at center position yet
-                    painter.drawText(centered_x + dx, centered_y + dy, text)
+    def _blend_frame_overlay(self, width: int, height: int):
+        """Blend the active highlight overlay into the resized preview in place."""
+        overlay = self.frame_overlay
+        image = self.overlay_image
+        if image is None or image.shape[:2] != (height, width):
+            mask = overlay.create_mask(mask_size=(width, height))
+            # Single pass: broadcast the color over the mask, zeros elsewhere
+            self.overlay_image = np.where(
+                (mask > 0)[..., None],
+                np.array(overlay.color, dtype=np.uint8),
+                np.uint8(0),
+            )
 
-        # Draw the colored text on top
-        painter.setPen(QPen(color))
-        painter.drawText(centered_x, centered_y, text)
+        cv2.addWeighted(
+            self.overlay_image,
+            overlay.alpha,
+            self.preview_view,
+            1 - overlay.alpha,
+            0,
+            dst=self.preview_view,
+        )
 
     def preview_side(self, side: str, frame_width: int, frame_height: int):
         """Show mask highlight for side selection."""
         if self.original_frame is not None and self.line_manager.has_line():
-            # Create a copy of the original frame for preview
-            preview_img = self.original_frame.copy()
-
-            # Create mask for side highlighting
-            mask = self.line_manager.create_side_mask(side, frame_width, frame_height)
-
-            # Apply green overlay to the selected side
-            overlay_color = np.array([0, 255, 0], dtype=preview_img.dtype)
-            overlay_img = np.zeros_like(preview_img)
-            overlay_img[mask > 0] = overlay_color
-
-            # Blend the original frame with the green overlay
-            highlighted_frame = cv2.addWeighted(overlay_img, 0.3, preview_img, 0.7, 0)
-
-            # Temporarily update the display
-            self.current_frame = highlighted_frame
-            self.update_preview()
+            self.current_frame = self.original_frame
+
+            # Green highlight of the selected side, rendered at preview size
+            self._set_frame_overlay(
+                _FrameOverlay(
+                    create_mask=partial(
+                        self.line_manager.create_side_mask,
+                        side,
+                        frame_width,
+                        frame_height,
+                    ),
+                    color=(0, 255, 0),
+                    alpha=0.3,
+                )
+            )
 
     def clear_preview(self):
         """Clear side preview and restore original frame."""
         if self.original_frame is not None:
-            self.current_frame = self.original_frame.copy()
-            self.update_preview()
+            self.current_frame = self.original_frame
+            self._set_frame_overlay(None)
 
     def reset_display(self):
         """Reset the display to initial state."""
@@ -359,7 +554,16 @@ class VideoDisplayWidget(QWidget):
         self.original_frame = None
         self.display_pixmap = None
         self.base_qimage = None
+        self.frame_pixmap = None
+        self.widget_buffer = None
+        self.preview_view = None
+        self.frame_overlay = None
+        self.overlay_image = None
+        self.line_overlay = None
+        self.line_overlay_key = None
         self.cached_preview_dims = None
+        self.gpu_frame_source = None
+        self.drag_update_timer.stop()
         self.video_label.clear()
         self.video_label.setText("No video loaded")
 
@@ -381,6 +585,7 @@ class VideoDisplayWidget(QWidget):
             if self.drawing_mode == "line" and self.line_manager.is_drawing:
                 self.is_drawing = True
                 self.start_point = (event.x(), event.y())
+                self.last_mouse_pos = self.start_point
 
                 # Convert widget coordinates to canvas coordinates for line manager
                 self.line_manager.start_line(
@@ -427,12 +632,18 @@ class VideoDisplayWidget(QWidget):
             and self.is_drawing
             and self.line_manager.is_drawing
         ):
+            mouse_pos = (event.x(), event.y())
+            if mouse_pos == self.last_mouse_pos:
+                return
+            self.last_mouse_pos = mouse_pos
+
             widget_width = self.video_label.width()
             widget_height = self.video_label.height()
             self.line_manager.update_line(
                 event.x(), event.y(), widget_width, widget_height
             )
-            self.update_preview()
+            if not self.drag_update_timer.isActive():
+                self.drag_update_timer.start()
 
             if self.line_update_callback:
                 self.line_update_callback()
@@ -448,6 +659,8 @@ class VideoDisplayWidget(QWidget):
             and self.is_drawing
         ):
             self.is_drawing = False
+            self.last_mouse_pos = None
+            self.drag_update_timer.stop()
 
             widget_width = self.video_label.width()
             widget_height = self.video_label.height()
@@ -465,9 +678,10 @@ class VideoDisplayWidget(QWidget):
         """Handle resize events to update preview."""
         super().resizeEvent(event)
         if self.current_frame is not None:
-            # Clear cached dimensions on resize
+            # Clear cached dimensions on resize; the redraw is deferred so a burst
+            # of resize events (e.g. dragging the splitter) renders only once
             self.cached_preview_dims = None
-            self.update_preview()
+            self.schedule_preview_update()
 
     def _draw_roi_overlay(self, painter: QPainter, roi_drawing_info: Dict[str, Any]):
         """Draw ROI polygon overlay."""
@@ -551,25 +765,19 @@ class VideoDisplayWidget(QWidget):
             and self.roi_manager.has_roi()
             and self.original_frame is not None
         ):
-            # Create a copy of the current frame for overlay
-            overlay_frame = self.current_frame.copy()
-
-            # Create ROI mask
-            roi_mask = self.roi_manager.create_roi_mask(frame_width, frame_height)
-
-            # Create colored overlay for ROI area
-            overlay_color = np.array([0, 255, 255], dtype=overlay_frame.dtype)  # Cyan
-            overlay_img = np.zeros_like(overlay_frame)
-            overlay_img[roi_mask > 0] = overlay_color
-
-            # Blend the frame with the ROI overlay
-            self.current_frame = cv2.addWeighted(
-                overlay_img, 0.2, overlay_frame, 0.8, 0
+            # Cyan highlight of the ROI area, rendered at preview size
+            self._set_frame_overlay(
+                _FrameOverlay(
+                    create_mask=partial(
+                        self.roi_manager.create_roi_mask, frame_width, frame_height
+                    ),
+                    color=(0, 255, 255),
+                    alpha=0.2,
+                )
             )
-            self.update_preview()
 
     def clear_roi_overlay(self):
         """Clear ROI overlay and restore original frame."""
         if self.original_frame is not None:
-            self.current_frame = self.original_frame.copy()
-            self.update_preview()
+            self.current_frame = self.original_frame
+            self._set_frame_overlay(None)
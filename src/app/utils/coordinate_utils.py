@@ -1,4 +1,6 @@
-from typing import Tuple
+from typing import Optional, Tuple
+
+import numpy as np
 
 
 class CoordinateTransformer:
@@ -8,6 +10,10 @@ class CoordinateTransformer:
         self.frame_width = frame_width
         self.frame_height = frame_height
 
+        # Last preview dimensions, keyed on canvas and frame size
+        self._preview_cache_key: Optional[Tuple[int, int, int, int]] = None
+        self._preview_dimensions: Tuple[int, int, int, int] = (0, 0, 0, 0)
+
     def update_frame_size(self, frame_width: int, frame_height: int):
         """Update frame dimensions."""
         self.frame_width = frame_width
@@ -17,6 +23,18 @@ class CoordinateTransformer:
         self, canvas_width: int, canvas_height: int
     ) -> Tuple[int, int, int, int]:
         """Calculate preview dimensions and offsets."""
+        cache_key = (canvas_width, canvas_height, self.frame_width, self.frame_height)
+        if cache_key != self._preview_cache_key:
+            self._preview_dimensions = self._compute_preview_dimensions(
+                canvas_width, canvas_height
+            )
+            self._preview_cache_key = cache_key
+        return self._preview_dimensions
+
+    def _compute_preview_dimensions(
+        self, canvas_width: int, canvas_height: int
+    ) -> Tuple[int, int, int, int]:
+        """Fit the frame into the canvas, keeping its aspect ratio."""
         if self.frame_width == 0 or self.frame_height == 0:
             return 0, 0, 0, 0
 
@@ -71,6 +89,34 @@ class CoordinateTransformer:
 
         return canvas_x, canvas_y
 
+    def frame_to_canvas_batch(
+        self,
+        frame_xs: np.ndarray,
+        frame_ys: np.ndarray,
+        canvas_width: int,
+        canvas_height: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert arrays of frame coordinates to canvas coordinates."""
+        preview_width, preview_height, x_offset, y_offset = self.get_preview_dimensions(
+            canvas_width, canvas_height
+        )
+
+        frame_xs = np.asarray(frame_xs)
+        frame_ys = np.asarray(frame_ys)
+        if preview_width == 0 or preview_height == 0:
+            return np.zeros(frame_xs.shape, dtype=int), np.zeros(
+                frame_ys.shape, dtype=int
+            )
+
+        canvas_xs = ((frame_xs / self.frame_width) * preview_width + x_offset).astype(
+            int
+        )
+        canvas_ys = ((frame_ys / self.frame_height) * preview_height + y_offset).astype(
+            int
+        )
+
+        return canvas_xs, canvas_ys
+
     def normalize_coordinates(self, x: int, y: int) -> Tuple[float, float]:
         """Normalize coordinates to 0-1 range."""
         if self.frame_width == 0 or self.frame_height == 0:
@@ -4,6 +4,11 @@ from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 from loguru import logger
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path is used without it
+    njit = None
+
 
 class CrossingCriteria(Enum):
     """Enum defining different criteria for line crossing detection."""
@@ -15,6 +20,84 @@ class CrossingCriteria(Enum):
     RIGHT = "right"
 
 
+# Reference point of a bbox per criterion as weights (a, b, c, d), with
+# ref_x = a * x_min + b * x_max and ref_y = c * y_min + d * y_max
+_REFERENCE_COEFFICIENTS = {
+    CrossingCriteria.CENTER: (0.5, 0.5, 0.5, 0.5),
+    CrossingCriteria.TOP: (0.5, 0.5, 1.0, 0.0),
+    CrossingCriteria.BOTTOM: (0.5, 0.5, 0.0, 1.0),
+    CrossingCriteria.LEFT: (1.0, 0.0, 0.5, 0.5),
+    CrossingCriteria.RIGHT: (0.0, 1.0, 0.5, 0.5),
+}
+
+
+_INITIAL_TRACK_CAPACITY = 64
+
+
+def _crossing_changes_loop(
+    prev_points,
+    current_points,
+    has_prev,
+    x1,
+    y1,
+    dx,
+    dy,
+    in_is_left,
+    roi_packed,
+    roi_row_bytes,
+    frame_width,
+    frame_height,
+):
+    """Per-track count change (+1, -1 or 0), compiled with numba when available.
+
+    Mirrors the NumPy path of LineCrossingCounter._get_crossing_changes
+    operation for operation, so both give identical results. An empty
+    roi_packed means no ROI.
+    """
+    changes = np.zeros(current_points.shape[0], dtype=np.int8)
+    has_roi = roi_packed.shape[0] > 0
+
+    for i in range(current_points.shape[0]):
+        prev_x, prev_y = prev_points[i, 0], prev_points[i, 1]
+        current_x, current_y = current_points[i, 0], current_points[i, 1]
+
+        # Tracks seen for the first time cannot cross; unseen slots hold zeros,
+        # so the side test below is still well defined for them
+        valid = has_prev[i]
+        if has_roi:
+            prev_row = min(max(int(prev_y * frame_height), 0), frame_height - 1)
+            prev_column = min(max(int(prev_x * frame_width), 0), frame_width - 1)
+            prev_byte = roi_packed[prev_row * roi_row_bytes + (prev_column >> 3)]
+            current_row = min(max(int(current_y * frame_height), 0), frame_height - 1)
+            current_column = min(max(int(current_x * frame_width), 0), frame_width - 1)
+            current_byte = roi_packed[
+                current_row * roi_row_bytes + (current_column >> 3)
+            ]
+            # packbits stores the leftmost pixel of each byte in its top bit
+            valid = (
+                valid
+                & ((prev_byte >> (7 - (prev_column & 7))) & 1 != 0)
+                & ((current_byte >> (7 - (current_column & 7))) & 1 != 0)
+            )
+
+        prev_on_in_side = (dx * (prev_y - y1) - dy * (prev_x - x1) > 0) == in_is_left
+        current_on_in_side = (
+            dx * (current_y - y1) - dy * (current_x - x1) > 0
+        ) == in_is_left
+
+        # +1 for OUT→IN, -1 for IN→OUT and 0 on the same side or for invalid
+        # tracks, without a branch
+        changes[i] = (int(current_on_in_side) - int(prev_on_in_side)) * int(valid)
+
+    return changes
+
+
+_crossing_changes_kernel = (
+    njit(cache=True)(_crossing_changes_loop) if njit is not None else None
+)
+_NO_ROI = np.zeros(0, dtype=np.uint8)
+
+
 class LineCrossingCounter:
     def __init__(
         self,
@@ -52,14 +135,26 @@ class LineCrossingCounter:
             raise ValueError("in_side must be either 'left' or 'right'")
         self.in_side = in_side
 
+        # Line coefficients for the side test, fixed for the counter's lifetime
+        (x1, y1), (x2, y2) = self.line_points
+        self._x1 = x1
+        self._y1 = y1
+        self._dx = x2 - x1
+        self._dy = y2 - y1
+        self._in_is_left = in_side == "left"
+
         # Handle crossing criteria
         if isinstance(crossing_criteria, str):
             self.crossing_criteria = CrossingCriteria(crossing_criteria)
         else:
             self.crossing_criteria = crossing_criteria
+        self._reference_coefficients = _REFERENCE_COEFFICIENTS[self.crossing_criteria]
 
         self.count = 0
-        self.tracked_positions = {}  # track_id -> previous position
+
+        # Per-track state as arrays indexed directly by track ID
+        self._prev_positions = np.zeros((_INITIAL_TRACK_CAPACITY, 2), dtype=np.float64)
+        self._seen = np.zeros(_INITIAL_TRACK_CAPACITY, dtype=bool)
         self.frame_width = frame_width
         self.frame_height = frame_height
 
@@ -71,6 +166,13 @@ class LineCrossingCounter:
                     f"ROI mask shape {roi_mask.shape} must match frame dimensions ({frame_height}, {frame_width})"
                 )
 
+        # Bit-packed copy of the mask, 8 pixels per byte so that lookups touch
+        # an eighth of the memory; rows are flattened, roi_row_bytes apart
+        self._roi_packed = (
+            None if roi_mask is None else np.packbits(roi_mask != 0, axis=1).ravel()
+        )
+        self._roi_row_bytes = (frame_width + 7) // 8
+
         # Log counter configuration
         roi_info = (
             f" with ROI (mask size: {roi_mask.shape})"
@@ -82,119 +184,186 @@ class LineCrossingCounter:
             f"criteria={self.crossing_criteria.value}, frame={frame_width}x{frame_height}{roi_info}"
         )
 
-    def _get_center(self, bbox: List[float]) -> Tuple[float, float]:
-        """Calculate the normalized center coordinates of a bounding box."""
-        center_x = (bbox[0] + bbox[2]) / 2
-        center_y = (bbox[1] + bbox[3]) / 2
-        return center_x / self.frame_width, center_y / self.frame_height
-
-    def _get_edge_point(self, bbox: List[float], edge: str) -> Tuple[float, float]:
-        """Get the normalized coordinates of a specific edge of the bbox."""
-        if edge == "top":
-            return (bbox[0] + bbox[2]) / 2 / self.frame_width, bbox[
-                1
-            ] / self.frame_height
-        elif edge == "bottom":
-            return (bbox[0] + bbox[2]) / 2 / self.frame_width, bbox[
-                3
-            ] / self.frame_height
-        elif edge == "left":
-            return bbox[0] / self.frame_width, (
-                bbox[1] + bbox[3]
-            ) / 2 / self.frame_height
-        elif edge == "right":
-            return bbox[2] / self.frame_width, (
-                bbox[1] + bbox[3]
-            ) / 2 / self.frame_height
-
-    def _get_reference_point(self, bbox: List[float]) -> Tuple[float, float]:
-        """Get the reference point based on the crossing criteria."""
-        if self.crossing_criteria == CrossingCriteria.CENTER:
-            return self._get_center(bbox)
-        elif self.crossing_criteria == CrossingCriteria.TOP:
-            return self._get_edge_point(bbox, "top")
-        elif self.crossing_criteria == CrossingCriteria.BOTTOM:
-            return self._get_edge_point(bbox, "bottom")
-        elif self.crossing_criteria == CrossingCriteria.LEFT:
-            return self._get_edge_point(bbox, "left")
-        elif self.crossing_criteria == CrossingCriteria.RIGHT:
-            return self._get_edge_point(bbox, "right")
-
-    def _is_point_on_in_side(self, point: Tuple[float, float]) -> bool:
-        """Check if a point is on the 'in' side of the line."""
-        x, y = point
-        (x1, y1), (x2, y2) = self.line_points
+    @property
+    def tracked_positions(self) -> Dict[int, Tuple[float, float]]:
+        """Previous normalized position of every remembered track."""
+        track_ids = np.flatnonzero(self._seen)
+        return dict(
+            zip(
+                track_ids.tolist(),
+                map(tuple, self._prev_positions[track_ids].tolist()),
+            )
+        )
 
-        # Calculate line vector
-        dx = x2 - x1
-        dy = y2 - y1
+    def _ensure_track_capacity(self, max_track_id: int):
+        """Grow the per-track arrays geometrically to hold max_track_id."""
+        capacity = len(self._seen)
+        if max_track_id < capacity:
+            return
 
-        # Calculate cross product to determine which side of the line the point is on
-        cross_product = dx * (y - y1) - dy * (x - x1)
+        new_capacity = max(2 * capacity, max_track_id + 1)
+        extra = new_capacity - capacity
+        self._prev_positions = np.concatenate(
+            (self._prev_positions, np.zeros((extra, 2), dtype=np.float64))
+        )
+        self._seen = np.concatenate((self._seen, np.zeros(extra, dtype=bool)))
 
-        # For non-horizontal lines
-        return (cross_product > 0) == (self.in_side == "left")
+    def _get_reference_points(self, bboxes: np.ndarray) -> np.ndarray:
+        """Get the normalized reference points of (N, 4) bboxes as an (N, 2) array."""
+        x_min, y_min, x_max, y_max = bboxes.T
+        a, b, c, d = self._reference_coefficients
 
-    def _is_point_in_roi(self, point: Tuple[float, float]) -> bool:
-        """Check if a normalized point is within the ROI mask."""
-        if self.roi_mask is None:
-            return True
+        ref_x = a * x_min + b * x_max
+        ref_y = c * y_min + d * y_max
 
-        # Convert normalized coordinates to pixel coordinates
-        x_pixel = int(point[0] * self.frame_width)
-        y_pixel = int(point[1] * self.frame_height)
+        return np.stack((ref_x / self.frame_width, ref_y / self.frame_height), axis=1)
 
-        # Clamp coordinates to valid range
-        x_pixel = max(0, min(x_pixel, self.frame_width - 1))
-        y_pixel = max(0, min(y_pixel, self.frame_height - 1))
+    def _are_points_on_in_side(self, points: np.ndarray) -> np.ndarray:
+        """Check which of the (N, 2) normalized points are on the 'in' side."""
+        # Calculate cross product to determine which side of the line each point is on
+        cross_product = self._dx * (points[:, 1] - self._y1) - self._dy * (
+            points[:, 0] - self._x1
+        )
+
+        return (cross_product > 0) == self._in_is_left
+
+    def _are_points_in_roi(self, points: np.ndarray) -> np.ndarray:
+        """Check which of the (N, 2) normalized points are within the ROI mask."""
+        if self._roi_packed is None:
+            return np.ones(len(points), dtype=bool)
+
+        # Convert normalized coordinates to pixel coordinates, clamped to the frame
+        x_pixel = (points[:, 0] * self.frame_width).astype(np.intp)
+        y_pixel = (points[:, 1] * self.frame_height).astype(np.intp)
+        np.clip(x_pixel, 0, self.frame_width - 1, out=x_pixel)
+        np.clip(y_pixel, 0, self.frame_height - 1, out=y_pixel)
+
+        byte_index = y_pixel * self._roi_row_bytes
+        byte_index += x_pixel >> 3
+        roi_bytes = self._roi_packed.take(byte_index)
+        # packbits stores the leftmost pixel of each byte in its top bit
+        return (roi_bytes >> (7 - (x_pixel & 7))) & 1 != 0
+
+    def _get_crossing_changes(
+        self, prev_points: np.ndarray, current_points: np.ndarray, has_prev: np.ndarray
+    ) -> np.ndarray:
+        """Count change per track: +1 for OUT→IN, -1 for IN→OUT, 0 otherwise."""
+        if _crossing_changes_kernel is not None:
+            return _crossing_changes_kernel(
+                prev_points,
+                current_points,
+                has_prev,
+                self._x1,
+                self._y1,
+                self._dx,
+                self._dy,
+                self._in_is_left,
+                _NO_ROI if self._roi_packed is None else self._roi_packed,
+                self._roi_row_bytes,
+                self.frame_width,
+                self.frame_height,
+            )
+
+        # Only count crossings where both points are within ROI
+        valid = (
+            has_prev
+            & self._are_points_in_roi(prev_points)
+            & self._are_points_in_roi(current_points)
+        )
 
-        return bool(self.roi_mask[y_pixel, x_pixel])
+        # Check for line crossing
+        prev_on_in_side = self._are_points_on_in_side(prev_points)
+        current_on_in_side = self._are_points_on_in_side(current_points)
+
+        # Moving from in to out decreases count, from out to in increases count;
+        # the side difference is already 0 for tracks that stay on one side
+        changes = current_on_in_side.astype(np.int8) - prev_on_in_side.astype(np.int8)
+        changes *= valid
+        return changes
 
     def update(self, tracked_objects: List[Dict]) -> int:
         """
         Update the counter based on tracked objects crossing the line.
 
+        All objects of a frame are processed together with NumPy; track IDs are
+        expected to be non-negative integers, unique within a frame, as produced
+        by the tracker.
+
         Args:
             tracked_objects: List of tracked objects with their positions
 
         Returns:
             Updated count
         """
-        crossings_this_frame = 0
+        if not tracked_objects:
+            return self.update_batch(np.empty((0, 4)), np.empty(0, dtype=np.intp))
 
-        for obj in tracked_objects:
-            track_id = obj["track_id"]
-            current_reference = self._get_reference_point(obj["bbox"])
+        track_ids = np.fromiter(
+            (obj["track_id"] for obj in tracked_objects),
+            dtype=np.intp,
+            count=len(tracked_objects),
+        )
+        bboxes = np.asarray([obj["bbox"] for obj in tracked_objects], dtype=np.float64)
+        return self.update_batch(bboxes, track_ids)
 
-            if track_id in self.tracked_positions:
-                prev_reference = self.tracked_positions[track_id]
+    def update_batch(self, bboxes: np.ndarray, track_ids: np.ndarray) -> int:
+        """
+        Update the counter from the arrays of a frame's tracked objects.
 
-                # Check if both points are within ROI before processing crossing
-                if self._is_point_in_roi(prev_reference) and self._is_point_in_roi(
-                    current_reference
-                ):
-                    # Check for line crossing
-                    prev_on_in_side = self._is_point_on_in_side(prev_reference)
-                    current_on_in_side = self._is_point_on_in_side(current_reference)
+        Same as update(), for callers that already hold the boxes and IDs as
+        arrays, so no per-object dicts have to be built.
 
-                    if prev_on_in_side != current_on_in_side:
-                        # Moving from in to out decreases count, from out to in increases count
-                        change = 1 if current_on_in_side else -1
-                        self.count += change
-                        crossings_this_frame += 1
+        Args:
+            bboxes: (N, 4) array of [x1, y1, x2, y2] boxes
+            track_ids: (N,) array of non-negative integer track IDs
+
+        Returns:
+            Updated count
+        """
+        if len(track_ids) == 0:
+            return self.count
+
+        ids = np.asarray(track_ids, dtype=np.intp)
+        if ids.min() < 0:
+            raise ValueError("Track IDs must be non-negative integers")
+        self._ensure_track_capacity(int(ids.max()))
+        bboxes = np.asarray(bboxes, dtype=np.float64)
+        current_references = self._get_reference_points(bboxes)
+
+        # Gather previous positions; tracks seen for the first time cannot cross
+        has_prev = self._seen[ids]
+        prev_references = self._prev_positions[ids]
+
+        changes = self._get_crossing_changes(
+            prev_references, current_references, has_prev
+        )
+        crossed = changes != 0
 
-                        direction = "OUT→IN" if change > 0 else "IN→OUT"
-                        logger.debug(
-                            f"Track {track_id} crossed line {direction}: count now {self.count}"
-                        )
+        crossings_this_frame = int(np.count_nonzero(crossed))
+        if crossings_this_frame > 0:
+            for track_id, change in zip(
+                ids[crossed].tolist(), changes[crossed].tolist()
+            ):
+                self.count += change
+
+                # Arguments are only formatted if a sink accepts DEBUG records
+                logger.debug(
+                    "Track {} crossed line {}: count now {}",
+                    track_id,
+                    "OUT→IN" if change > 0 else "IN→OUT",
+                    self.count,
+                )
 
-            # Update previous position
-            self.tracked_positions[track_id] = current_reference
+        # Update previous positions
+        self._prev_positions[ids] = current_references
+        self._seen[ids] = True
 
         # Log summary for frames with crossings
         if crossings_this_frame > 0:
             logger.info(
-                f"Frame update: {crossings_this_frame} crossing(s) detected, total count: {self.count}"
+                "Frame update: {} crossing(s) detected, total count: {}",
+                crossings_this_frame,
+                self.count,
             )
 
         return self.count
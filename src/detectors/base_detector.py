@@ -22,3 +22,18 @@ class BaseDetector(ABC):
             }
         """
         pass
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[Dict]]:
+        """
+        Detect people in several frames.
+
+        Detectors that support batched inference should override this; the
+        default runs detect() on each frame.
+
+        Args:
+            frames: List of input frames as numpy arrays
+
+        Returns:
+            One list of detections per frame, in the same format as detect()
+        """
+        return [self.detect(frame) for frame in frames]
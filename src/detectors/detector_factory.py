@@ -9,16 +9,31 @@ class DetectorFactory:
         Create a detector instance based on the specified type.
 
         Args:
-            detector_type: Type of detector ('yolo' or 'deepface')
+            detector_type: Type of detector ('yolo' or 'onnx')
             **kwargs: Additional arguments for detector initialization
                 For YOLO:
                     - model_path: Path to the YOLO model
                     - conf_threshold: Confidence threshold
+                For ONNX (YOLOv8 run with onnxruntime):
+                    - model_path: Path to the ONNX model or the YOLO weights
+                    - conf_threshold: Confidence threshold
+                    - iou_threshold: NMS IoU threshold
 
         Returns:
             An instance of the specified detector
         """
         if detector_type.lower() == "yolo":
             return YoloDetector(**kwargs)
+        elif detector_type.lower() == "onnx":
+            # onnxruntime is optional, so it is only imported when requested
+            try:
+                from detectors.onnx_detector import OnnxDetector
+            except ImportError as e:
+                raise ImportError(
+                    "The 'onnx' detector needs onnxruntime and onnx: "
+                    "pip install -r requirements-onnx.txt"
+                ) from e
+
+            return OnnxDetector(**kwargs)
         else:
             raise ValueError(f"Unknown detector type: {detector_type}")
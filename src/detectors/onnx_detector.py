@@ -0,0 +1,281 @@
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+from loguru import logger
+
+from detectors.base_detector import BaseDetector
+
+
+class OnnxDetector(BaseDetector):
+    def __init__(
+        self,
+        model_path: str = "yolov8s.pt",
+        class_id: int = 0,
+        conf_threshold: float = 0.5,
+        input_height: int = 640,
+        input_width: int = 640,
+        iou_threshold: float = 0.7,
+        half: bool = False,
+        int8: bool = False,
+        calibration_video: Optional[str] = None,
+        calibration_frames: int = 200,
+        tensorrt: bool = False,
+        engine_batch_size: int = 1,
+        gpu_preprocess: bool = False,
+    ):
+        """
+        Initialize the person detector with a YOLOv8 ONNX model run directly by
+        onnxruntime, without the ultralytics predictor.
+
+        Args:
+            model_path: Path to the ONNX model, or to ultralytics weights that
+                are exported to ONNX next to them on first use
+            class_id: Class ID of a person
+            conf_threshold: Confidence threshold for detections
+            input_height: Height of the model input
+            input_width: Width of the model input
+            iou_threshold: IoU threshold for non-maximum suppression
+            half: Let the TensorRT execution provider run in FP16
+            int8: Quantize the model to INT8 on first use and run it on the
+                CPU execution provider
+            calibration_video: Video whose frames calibrate the INT8
+                quantization
+            calibration_frames: Number of calibration frames to read
+            tensorrt: YOLO detector option, ignored; accepted so that one
+                detector config serves both detector types
+            engine_batch_size: YOLO detector option, ignored
+            gpu_preprocess: YOLO detector option, ignored
+        """
+        if tensorrt or gpu_preprocess:
+            logger.info("ONNX detector ignores the tensorrt and gpu_preprocess options")
+
+        self.conf_threshold = conf_threshold
+        self.person_class_id = class_id
+        self.input_height = input_height
+        self.input_width = input_width
+        self.iou_threshold = iou_threshold
+
+        if not model_path.endswith(".onnx"):
+            model_path = self._export_onnx(model_path)
+
+        # Prefer TensorRT, then CUDA, then CPU, among the providers installed;
+        # the INT8 model targets the CPU's integer dot-product instructions
+        available_providers = (
+            ["CPUExecutionProvider"] if int8 else ort.get_available_providers()
+        )
+        providers = [
+            provider
+            for provider in [
+                ("TensorrtExecutionProvider", {"trt_fp16_enable": half}),
+                "CUDAExecutionProvider",
+                "CPUExecutionProvider",
+            ]
+            if (provider[0] if isinstance(provider, tuple) else provider)
+            in available_providers
+        ]
+        if int8:
+            # Calibration letterboxes frames to the model input, so its shape
+            # is read from the graph before the quantized model exists
+            self.input_name, self.model_height, self.model_width = (
+                self._read_model_input(model_path)
+            )
+            model_path = self._quantize_int8(
+                model_path, calibration_video, calibration_frames
+            )
+
+        self.session = ort.InferenceSession(model_path, providers=providers)
+        logger.info(f"Using {self.session.get_providers()[0]} for detection")
+        if int8:
+            logger.info("Using the INT8 model for detection")
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # The exported model has a fixed (1, 3, height, width) input
+        self.model_height, self.model_width = model_input.shape[2:]
+
+    @staticmethod
+    def _read_model_input(model_path: str) -> Tuple[str, int, int]:
+        """Read the input name, height and width from the ONNX graph."""
+        # onnx is required by onnxruntime's quantization tools anyway
+        import onnx
+
+        graph_input = onnx.load(model_path, load_external_data=False).graph.input[0]
+        dims = graph_input.type.tensor_type.shape.dim
+        return graph_input.name, dims[2].dim_value, dims[3].dim_value
+
+    def _quantize_int8(
+        self,
+        model_path: str,
+        calibration_video: Optional[str],
+        calibration_frames: int,
+    ) -> str:
+        """
+        Statically quantize the model to INT8, cached next to it.
+
+        The cached file name carries a hash of the source model's path and
+        modification time and of the calibration settings, so changing any of
+        them quantizes again.
+        """
+        if calibration_video is None:
+            raise ValueError("INT8 quantization needs a calibration_video")
+
+        source = Path(model_path)
+        cache_key = hashlib.sha1(
+            f"{source.resolve()}:{source.stat().st_mtime_ns}:"
+            f"{Path(calibration_video).resolve()}:{calibration_frames}".encode()
+        ).hexdigest()[:8]
+        int8_path = source.with_name(f"{source.stem}.int8-{cache_key}.onnx")
+        if int8_path.exists():
+            return str(int8_path)
+
+        from onnxruntime.quantization import (
+            CalibrationDataReader,
+            QuantType,
+            quantize_static,
+        )
+
+        detector = self
+
+        class FrameReader(CalibrationDataReader):
+            """Feeds letterboxed video frames to the calibrator."""
+
+            def __init__(self):
+                self.cap = cv2.VideoCapture(calibration_video)
+                self.remaining = calibration_frames
+
+            def get_next(self):
+                if self.remaining == 0:
+                    return None
+                ret, frame = self.cap.read()
+                if not ret:
+                    return None
+                self.remaining -= 1
+                image, _, _ = detector._letterbox(frame)
+                return {detector.input_name: image}
+
+        logger.info(f"Quantizing ONNX model to {int8_path}...")
+        reader = FrameReader()
+        try:
+            quantize_static(
+                model_path,
+                str(int8_path),
+                reader,
+                activation_type=QuantType.QInt8,
+                weight_type=QuantType.QInt8,
+                per_channel=True,
+            )
+        finally:
+            reader.cap.release()
+        return str(int8_path)
+
+    def _export_onnx(self, model_path: str) -> str:
+        """
+        Export ultralytics weights to an ONNX model cached next to them.
+
+        The exported model has a fixed input size, which is part of the cached
+        file name.
+        """
+        weights = Path(model_path)
+        onnx_path = weights.with_name(
+            f"{weights.stem}_{self.input_width}x{self.input_height}.onnx"
+        )
+        if onnx_path.exists():
+            return str(onnx_path)
+
+        # ultralytics is only needed for the one-time export
+        from ultralytics import YOLO
+
+        logger.info(f"Exporting ONNX model to {onnx_path}...")
+        exported_path = YOLO(model_path).export(
+            format="onnx",
+            imgsz=[self.input_width, self.input_height],
+            opset=17,
+            dynamic=False,
+        )
+        return str(Path(exported_path).replace(onnx_path))
+
+    def detect(self, frame: np.ndarray) -> List[Dict]:
+        """
+        Detect people in the given frame.
+
+        Args:
+            frame: Input frame as numpy array
+
+        Returns:
+            List of dictionaries containing detection information:
+            {
+                'bbox': [x1, y1, x2, y2],
+                'confidence': float,
+                'class_id': int
+            }
+        """
+        image, gain, (top, left) = self._letterbox(frame)
+        # (1, 4 + num_classes, num_boxes): cx, cy, w, h, then class scores
+        predictions = self.session.run(None, {self.input_name: image})[0][0]
+
+        # Keep boxes whose best class is a person, like ultralytics' NMS
+        scores = predictions[4 + self.person_class_id]
+        keep = (scores > self.conf_threshold) & (
+            predictions[4:].argmax(axis=0) == self.person_class_id
+        )
+        if not keep.any():
+            return []
+        scores = scores[keep]
+        cx, cy, w, h = predictions[:4, keep]
+
+        # Suppress overlapping boxes in model input coordinates, as
+        # ultralytics does
+        xywh = np.stack([cx - w / 2, cy - h / 2, w, h], axis=1)
+        indices = cv2.dnn.NMSBoxes(
+            xywh.tolist(), scores.tolist(), self.conf_threshold, self.iou_threshold
+        )
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1)
+
+        # Map the kept boxes back to frame coordinates
+        boxes = xywh[indices]
+        boxes[:, 2:] += boxes[:, :2]
+        boxes[:, [0, 2]] = (boxes[:, [0, 2]] - left) / gain
+        boxes[:, [1, 3]] = (boxes[:, [1, 3]] - top) / gain
+        frame_height, frame_width = frame.shape[:2]
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, frame_width)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, frame_height)
+
+        return [
+            {
+                "bbox": bbox.tolist(),
+                "confidence": float(score),
+                "class_id": self.person_class_id,
+            }
+            for bbox, score in zip(boxes, scores[indices])
+        ]
+
+    def _letterbox(self, frame: np.ndarray):
+        """
+        Resize and pad a BGR frame to the model input like ultralytics does.
+
+        Returns the (1, 3, height, width) float32 RGB input, the resize gain and
+        the (top, left) padding.
+        """
+        height, width = frame.shape[:2]
+        gain = min(self.model_height / height, self.model_width / width)
+        new_height, new_width = round(height * gain), round(width * gain)
+        if (new_height, new_width) != (height, width):
+            frame = cv2.resize(
+                frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR
+            )
+
+        pad_height = (self.model_height - new_height) / 2
+        pad_width = (self.model_width - new_width) / 2
+        top, bottom = round(pad_height - 0.1), round(pad_height + 0.1)
+        left, right = round(pad_width - 0.1), round(pad_width + 0.1)
+        frame = cv2.copyMakeBorder(
+            frame, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114)
+        )
+
+        image = frame[..., ::-1].transpose(2, 0, 1)[None]
+        image = np.ascontiguousarray(image, dtype=np.float32) / 255.0
+        return image, gain, (top, left)
@@ -37,3 +37,15 @@ class PersonDetector:
             }
         """
         return self.detector.detect(frame)
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[Dict]]:
+        """
+        Detect persons in several frames at once.
+
+        Args:
+            frames: List of input frames as numpy arrays
+
+        Returns:
+            One list of person detections per frame, in the same format as detect()
+        """
+        return self.detector.detect_batch(frames)
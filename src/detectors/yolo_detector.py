@@ -1,9 +1,11 @@
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import torch
 from loguru import logger
 from ultralytics import YOLO
+from ultralytics.utils import ops
 
 from detectors.base_detector import BaseDetector
 
@@ -16,6 +18,10 @@ class YoloDetector(BaseDetector):
         conf_threshold: float = 0.5,
         input_height: int = 640,
         input_width: int = 640,
+        half: bool = False,
+        tensorrt: bool = False,
+        engine_batch_size: int = 1,
+        gpu_preprocess: bool = False,
     ):
         """
         Initialize the person detector with YOLOv8.
@@ -25,19 +31,69 @@ class YoloDetector(BaseDetector):
             conf_threshold: Confidence threshold for detections
             input_height: Height of the input frame
             input_width: Width of the input frame
+            half: Run inference in FP16 (GPU only)
+            tensorrt: Export the weights to a TensorRT engine on first use and
+                run inference with it (GPU only)
+            engine_batch_size: Largest batch the TensorRT engine is built for
+            gpu_preprocess: Letterbox frames on the GPU instead of in
+                ultralytics' CPU preprocessing (GPU only)
         """
-        self.model = YOLO(model_path)
-        if torch.cuda.is_available():
-            self.model.to("cuda")
-            logger.info("Using GPU for detection")
-        else:
-            logger.info("Using CPU for detection")
-        self.model.eval()
         self.conf_threshold = conf_threshold
         self.person_class_id = class_id
         self.input_height = input_height
         self.input_width = input_width
 
+        use_cuda = torch.cuda.is_available()
+        self.half = half and use_cuda
+        self.gpu_preprocess = gpu_preprocess and use_cuda
+        # Pinned host buffer the frames are staged in before the upload
+        self._staging_buffer: Optional[torch.Tensor] = None
+
+        if tensorrt and not use_cuda:
+            logger.warning("TensorRT requested but CUDA is not available")
+        elif tensorrt and not model_path.endswith(".engine"):
+            model_path = self._export_engine(model_path, engine_batch_size)
+
+        self.model = YOLO(model_path)
+        self.is_engine = model_path.endswith(".engine")
+        if self.is_engine:
+            # Engines are bound to the GPU and precision they were built with
+            logger.info(f"Using TensorRT engine for detection: {model_path}")
+        else:
+            if use_cuda:
+                self.model.to("cuda")
+                logger.info("Using GPU for detection")
+            else:
+                logger.info("Using CPU for detection")
+            self.model.eval()
+
+    def _export_engine(self, model_path: str, batch_size: int) -> str:
+        """
+        Export the weights to a TensorRT engine cached next to them.
+
+        Engines only accept the input size, batch size and precision they were
+        built for, so these are part of the cached file name.
+        """
+        weights = Path(model_path)
+        precision = "fp16" if self.half else "fp32"
+        engine_path = weights.with_name(
+            f"{weights.stem}_{self.input_width}x{self.input_height}"
+            f"_b{batch_size}_{precision}.engine"
+        )
+        if engine_path.exists():
+            return str(engine_path)
+
+        logger.info(f"Exporting TensorRT engine to {engine_path}...")
+        # Dynamic shapes let the engine also take the shorter last batch
+        exported_path = YOLO(model_path).export(
+            format="engine",
+            half=self.half,
+            imgsz=[self.input_width, self.input_height],
+            dynamic=True,
+            batch=batch_size,
+        )
+        return str(Path(exported_path).replace(engine_path))
+
     def detect(self, frame: np.ndarray) -> List[Dict]:
         """
         Detect people in the given frame.
@@ -53,20 +109,118 @@ class YoloDetector(BaseDetector):
                 'class_id': int
             }
         """
-        results = self.model(
-            frame, verbose=False, imgsz=[self.input_width, self.input_height]
-        )[0]
-        detections = []
-
-        for box in results.boxes:
-            if box.cls == self.person_class_id and box.conf > self.conf_threshold:
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                detections.append(
-                    {
-                        "bbox": [x1, y1, x2, y2],
-                        "confidence": float(box.conf),
-                        "class_id": int(box.cls),
-                    }
-                )
-
-        return detections
+        if self.gpu_preprocess:
+            results = self._predict(self._preprocess_gpu([frame]))[0]
+            return self._parse_results(results, frame.shape[:2])
+
+        results = self._predict(frame)[0]
+        return self._parse_results(results)
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[Dict]]:
+        """
+        Detect people in several frames with a single batched forward pass.
+
+        Args:
+            frames: List of input frames as numpy arrays
+
+        Returns:
+            One list of detections per frame, in the same format as detect()
+        """
+        if not frames:
+            return []
+
+        # Frames are staged in one buffer, so they must share a shape
+        if self.gpu_preprocess and all(f.shape == frames[0].shape for f in frames):
+            results = self._predict(self._preprocess_gpu(frames))
+            return [
+                self._parse_results(frame_results, frames[0].shape[:2])
+                for frame_results in results
+            ]
+
+        results = self._predict(frames)
+        return [self._parse_results(frame_results) for frame_results in results]
+
+    def _predict(self, source):
+        """Run the model on frames or on an already preprocessed tensor."""
+        return self.model(
+            source,
+            verbose=False,
+            imgsz=[self.input_width, self.input_height],
+            half=self.half,
+        )
+
+    def _preprocess_gpu(self, frames: List[np.ndarray]) -> torch.Tensor:
+        """
+        Upload same-sized BGR frames and letterbox them on the GPU.
+
+        Mirrors ultralytics' CPU preprocessing (BGR to RGB, aspect-preserving
+        resize, centered grey padding, scaling to [0, 1]) so the model sees the
+        same input, and returns a (B, 3, H, W) float tensor it accepts as is.
+        """
+        batch_shape = (len(frames), *frames[0].shape)
+        if self._staging_buffer is None or self._staging_buffer.shape != batch_shape:
+            self._staging_buffer = torch.empty(
+                batch_shape, dtype=torch.uint8, pin_memory=True
+            )
+        # The previous upload has finished by now: its results were copied
+        # back to the host before this call
+        for staged, frame in zip(self._staging_buffer, frames):
+            staged.copy_(torch.from_numpy(frame))
+        batch = self._staging_buffer.to("cuda", non_blocking=True)
+
+        batch = batch.flip(-1).permute(0, 3, 1, 2).float() / 255.0
+
+        # ultralytics reads imgsz as (height, width)
+        target_height, target_width = self.input_width, self.input_height
+        height, width = frames[0].shape[:2]
+        gain = min(target_height / height, target_width / width)
+        new_height, new_width = round(height * gain), round(width * gain)
+        if (new_height, new_width) != (height, width):
+            batch = torch.nn.functional.interpolate(
+                batch,
+                size=(new_height, new_width),
+                mode="bilinear",
+                align_corners=False,
+            )
+
+        pad_height = target_height - new_height
+        pad_width = target_width - new_width
+        if not self.is_engine:
+            # PyTorch models only need each side to be a stride multiple
+            pad_height, pad_width = pad_height % 32, pad_width % 32
+        top, left = round(pad_height / 2 - 0.1), round(pad_width / 2 - 0.1)
+        return torch.nn.functional.pad(
+            batch,
+            (left, pad_width - left, top, pad_height - top),
+            value=114 / 255.0,
+        )
+
+    def _parse_results(
+        self, results, frame_shape: Optional[Tuple[int, int]] = None
+    ) -> List[Dict]:
+        """
+        Convert the ultralytics results of one frame into detection dicts.
+
+        frame_shape is the original (height, width) when the model was fed a
+        letterboxed tensor, so the boxes are mapped back to frame coordinates.
+        """
+        # Boxes data rows are [x1, y1, x2, y2, conf, cls]; filter on the device
+        # and copy the kept rows to the host in a single transfer. Compare in
+        # FP32 so FP16 inference filters exactly like FP32 inference
+        data = results.boxes.data.float()
+        keep = (data[:, -1] == self.person_class_id) & (
+            data[:, -2] > self.conf_threshold
+        )
+        kept = data[keep]
+        if frame_shape is not None:
+            kept[:, :4] = ops.scale_boxes(results.orig_shape, kept[:, :4], frame_shape)
+        kept = kept.cpu().numpy()
+
+        return [
+            {
+                "bbox": row[:4].tolist(),
+                "confidence": float(row[-2]),
+                "class_id": int(row[-1]),
+            }
+            for row in kept
+        ]
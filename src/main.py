@@ -1,8 +1,15 @@
 import argparse
+import heapq
+import multiprocessing
 import os
+import queue
+import threading
 import time
+import traceback
+from contextlib import closing
 
 import cv2
+import numpy as np
 import yaml
 from loguru import logger
 
@@ -10,15 +17,314 @@ from counter import LineCrossingCounter
 from detectors import PersonDetector
 from tracker import PersonTracker
 
+# More workers stop paying off once they saturate a single GPU
+MAX_DETECTION_WORKERS = 4
+
 
 def load_config(config_path="config.yaml"):
     with open(config_path, "r") as f:
         return yaml.safe_load(f)
 
 
+class BackgroundVideoWriter:
+    """cv2.VideoWriter that encodes frames on a background thread."""
+
+    def __init__(self, *writer_args, max_queued_frames=8):
+        self.writer = cv2.VideoWriter(*writer_args)
+        self.frame_queue = queue.Queue(maxsize=max_queued_frames)
+        self.thread = threading.Thread(target=self._write_frames, daemon=True)
+        self.thread.start()
+
+    def _write_frames(self):
+        # cv2 releases the GIL while encoding, so this overlaps with the main loop
+        while True:
+            frame = self.frame_queue.get()
+            if frame is None:
+                break
+            self.writer.write(frame)
+
+    def write(self, frame):
+        """Queue a frame for writing; the caller must not modify it afterwards."""
+        self.frame_queue.put(frame)
+
+    def release(self):
+        """Write the remaining queued frames and close the file."""
+        self.frame_queue.put(None)
+        self.thread.join()
+        self.writer.release()
+
+
+def open_video(path, hw_decode=False):
+    """
+    Open a video file, optionally asking FFmpeg for hardware-accelerated
+    decoding (NVDEC, VA-API, ...).
+
+    Frames are still returned as BGR images in host memory, so the rest of the
+    pipeline is unchanged; OpenCV falls back to software decoding when no
+    accelerator is available.
+    """
+    if not hw_decode:
+        return cv2.VideoCapture(path)
+
+    cap = cv2.VideoCapture(
+        path,
+        cv2.CAP_FFMPEG,
+        [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+    )
+    acceleration = int(cap.get(cv2.CAP_PROP_HW_ACCELERATION))
+    if acceleration == cv2.VIDEO_ACCELERATION_NONE:
+        logger.info("Hardware video decoding unavailable, decoding on the CPU")
+    else:
+        logger.info(f"Using hardware video decoding (type {acceleration})")
+    return cap
+
+
+class MotionGate:
+    """Tells frames with motion apart from near-static ones, cheaply."""
+
+    def __init__(self, pixel_threshold=15, min_motion_pixels=20, size=(128, 72)):
+        """
+        Args:
+            pixel_threshold: Per-pixel difference that counts as motion
+            min_motion_pixels: Moving pixels, at the reduced size, a frame
+                needs to count as moving
+            size: (width, height) the frames are compared at
+        """
+        self.pixel_threshold = pixel_threshold
+        self.min_motion_pixels = min_motion_pixels
+        self.size = size
+        self.background = None  # running average of the reduced frames
+
+    def has_motion(self, frame):
+        """Compare frame with the running background and update it."""
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        small = small.astype(np.float32)
+        if self.background is None:
+            self.background = small
+            return True
+
+        diff = cv2.absdiff(small, self.background)
+        cv2.accumulateWeighted(small, self.background, 0.5)
+        moving_pixels = np.count_nonzero(diff.max(axis=2) > self.pixel_threshold)
+        return moving_pixels >= self.min_motion_pixels
+
+
+def skip_late_frames(cap, frame_id, start_time, fps):
+    """
+    Skip the frames whose playback time has already passed.
+
+    Frames are skipped with cap.grab(), which does not decode them. Returns the
+    id of the next frame cap.read() will return.
+    """
+    due_frame_id = int((time.perf_counter() - start_time) * fps)
+    while frame_id < due_frame_id and cap.grab():
+        frame_id += 1
+    return frame_id
+
+
+def read_frames(cap, frame_queue, stop_event, realtime_fps=None):
+    """
+    Read (frame_id, frame) items into frame_queue until the video ends or
+    stop_event is set.
+
+    With realtime_fps set, frames that fall behind the wall clock are skipped,
+    so processing stays at most the queue length behind real time.
+    """
+    start_time = time.perf_counter()
+    frame_id = 0
+    while not stop_event.is_set():
+        if realtime_fps:
+            frame_id = skip_late_frames(cap, frame_id, start_time, realtime_fps)
+        ret_val, frame = cap.read()
+        if not ret_val:
+            break
+        frame_queue.put((frame_id, frame))
+        frame_id += 1
+    frame_queue.put(None)
+
+
+def read_frame_batches(cap, batch_size, realtime_fps=None):
+    """
+    Yield lists of up to batch_size (frame_id, frame) items, decoded ahead in a
+    reader thread.
+    """
+    # cv2 releases the GIL while decoding, so reading overlaps with inference
+    frame_queue = queue.Queue(maxsize=2 * batch_size)
+    stop_event = threading.Event()
+    reader = threading.Thread(
+        target=read_frames,
+        args=(cap, frame_queue, stop_event, realtime_fps),
+        daemon=True,
+    )
+    reader.start()
+
+    try:
+        batch = []
+        while True:
+            item = frame_queue.get()
+            if item is None:
+                break
+            batch.append(item)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        # Stop the reader, draining the queue in case it is blocked on put()
+        stop_event.set()
+        while reader.is_alive():
+            try:
+                frame_queue.get_nowait()
+            except queue.Empty:
+                pass
+            reader.join(timeout=0.05)
+
+
+def detect_frames_batched(
+    cap, detector, batch_size, realtime_fps=None, motion_gate=None
+):
+    """
+    Yield (frame_id, frame, detections) in order, detecting batch_size frames
+    at a time.
+
+    With a motion_gate, near-static frames are not detected and reuse the
+    detections of the frame before them.
+    """
+    detections = []
+    with closing(read_frame_batches(cap, batch_size, realtime_fps)) as frame_batches:
+        for batch in frame_batches:
+            frame_ids, frames = zip(*batch)
+            if motion_gate is None:
+                # Detect people in the whole batch with one forward pass
+                yield from zip(frame_ids, frames, detector.detect_batch(list(frames)))
+                continue
+
+            moving = [motion_gate.has_motion(frame) for frame in frames]
+            batch_detections = iter(
+                detector.detect_batch(
+                    [frame for frame, is_moving in zip(frames, moving) if is_moving]
+                )
+            )
+            for frame_id, frame, is_moving in zip(frame_ids, frames, moving):
+                if is_moving:
+                    detections = next(batch_detections)
+                yield frame_id, frame, detections
+
+
+def detection_worker(detector_config, input_queue, output_queue):
+    """
+    Detect people in (frame_id, frame) items until a None item arrives.
+
+    Puts None on the output queue when done, or the formatted traceback if
+    the detector fails, so the parent never waits on a dead worker.
+    """
+    try:
+        detector = PersonDetector(**detector_config)
+        while True:
+            item = input_queue.get()
+            if item is None:
+                break
+            frame_id, frame = item
+            output_queue.put((frame_id, detector.detect(frame)))
+    except Exception:
+        output_queue.put(traceback.format_exc())
+        return
+    output_queue.put(None)
+
+
+def detect_frames_in_workers(cap, detector_config, num_workers, realtime_fps=None):
+    """
+    Yield (frame_id, frame, detections) in order, detecting in parallel worker
+    processes.
+    """
+    # Spawn so that every worker initializes its own CUDA context
+    context = multiprocessing.get_context("spawn")
+    input_queue = context.Queue(maxsize=2 * num_workers)
+    output_queue = context.Queue()
+    workers = [
+        context.Process(
+            target=detection_worker,
+            args=(detector_config, input_queue, output_queue),
+            daemon=True,
+        )
+        for _ in range(num_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Work items are numbered consecutively for the reorder buffer; that
+    # number differs from the frame id once realtime mode skips frames
+    frames = {}  # item number -> (frame_id, frame) waiting for its detections
+    stop_event = threading.Event()
+
+    def feed_workers():
+        start_time = time.perf_counter()
+        frame_id = 0
+        item_number = 0
+        while not stop_event.is_set():
+            if realtime_fps:
+                frame_id = skip_late_frames(cap, frame_id, start_time, realtime_fps)
+            ret_val, frame = cap.read()
+            if not ret_val:
+                break
+            frames[item_number] = (frame_id, frame)
+            input_queue.put((item_number, frame))
+            frame_id += 1
+            item_number += 1
+        for _ in workers:
+            input_queue.put(None)
+
+    feeder = threading.Thread(target=feed_workers, daemon=True)
+    feeder.start()
+
+    try:
+        # Reorder buffer: results arrive in completion order, frames leave in
+        # frame order
+        pending = []
+        next_item_number = 0
+        finished_workers = 0
+        while finished_workers < num_workers:
+            try:
+                result = output_queue.get(timeout=1.0)
+            except queue.Empty:
+                # A worker killed outright (e.g. by the OOM killer) sends
+                # nothing, so check that none has died
+                for worker in workers:
+                    if worker.exitcode not in (None, 0):
+                        raise RuntimeError(
+                            f"Detection worker exited with code {worker.exitcode}"
+                        )
+                continue
+            if isinstance(result, str):
+                raise RuntimeError(f"Detection worker failed:\n{result}")
+            if result is None:
+                finished_workers += 1
+                continue
+
+            heapq.heappush(pending, result)
+            while pending and pending[0][0] == next_item_number:
+                _, detections = heapq.heappop(pending)
+                frame_id, frame = frames.pop(next_item_number)
+                yield frame_id, frame, detections
+                next_item_number += 1
+    finally:
+        # Stop the feeder, draining the queue in case it is blocked on put()
+        stop_event.set()
+        while feeder.is_alive():
+            try:
+                input_queue.get_nowait()
+            except queue.Empty:
+                pass
+            feeder.join(timeout=0.05)
+        for worker in workers:
+            worker.terminate()
+            worker.join()
+
+
 def main(config):
     # Initialize video capture
-    cap = cv2.VideoCapture(config["video"]["path"])
+    cap = open_video(config["video"]["path"], config["video"].get("hw_decode", False))
     if not cap.isOpened():
         raise ValueError(f"Could not open video file: {config['video']['path']}")
 
@@ -44,167 +350,221 @@ def main(config):
     p1 = (int(p1[0] * scale), int(p1[1] * scale))
     p2 = (int(p2[0] * scale), int(p2[1] * scale))
 
+    # The line is static, so the in/out label positions are computed once
+    line_vector = (p2[0] - p1[0], p2[1] - p1[1])
+    line_length = (line_vector[0] ** 2 + line_vector[1] ** 2) ** 0.5
+    line_normal = (-line_vector[1] / line_length, line_vector[0] / line_length)
+    label_offset = 30
+    in_label_pos = (
+        int((p1[0] + p2[0]) / 2 + line_normal[0] * label_offset),
+        int((p1[1] + p2[1]) / 2 + line_normal[1] * label_offset),
+    )
+    out_label_pos = (
+        int((p1[0] + p2[0]) / 2 - line_normal[0] * label_offset),
+        int((p1[1] + p2[1]) / 2 - line_normal[1] * label_offset),
+    )
+
+    # Display size that fits the screen while maintaining aspect ratio; the
+    # window can be disabled for headless runs
+    show_display = config["display"].get("enabled", True)
+    display_scale = min(
+        config["display"]["max_width"] / width,
+        config["display"]["max_height"] / height,
+    )
+    display_size = (int(width * display_scale), int(height * display_scale))
+    display_resize_needed = display_size != (width, height)
+
     # Setup video writer if saving results
     if config["video"]["save_result"]:
         timestamp = time.strftime("%Y_%m_%d_%H_%M_%S", time.localtime())
         save_folder = os.path.join("outputs", timestamp)
         os.makedirs(save_folder, exist_ok=True)
         save_path = os.path.join(save_folder, os.path.basename(config["video"]["path"]))
-        vid_writer = cv2.VideoWriter(
+        vid_writer = BackgroundVideoWriter(
             save_path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height)
         )
 
+        # Tracking results are streamed to disk in MOT format as they come in
+        results_path = os.path.join(save_folder, "results.txt")
+        results_file = open(results_path, "w", buffering=1 << 20)
+
     # Initialize components
-    detector = PersonDetector(**config["detector"])
     tracker = PersonTracker(**config["tracking"])
     counter = LineCrossingCounter(line_points, config["line"]["in_side"], width, height)
 
-    frame_id = 0
-    results = []
+    next_frame_id = 0
     previous_count = 0
+    count_text = f"Count: {previous_count}"
 
     # FPS calculation variables
     display_fps = 0.0
     frame_start_time = time.time()
 
-    while True:
-        # Start timing for this frame
-        frame_start_time = time.time()
-
-        ret_val, frame = cap.read()
-        if not ret_val:
-            break
-
-        # Detect people
-        detections = detector.detect(frame)
-
-        # Track people
-        tracked_objects = tracker.update(
-            detections,
-            [height, width],
-            (height, width),  # Using original image size
-        )
+    # In realtime mode frames that fall behind the video's own frame rate are
+    # skipped instead of queuing up
+    realtime_fps = fps if config["video"].get("realtime", False) and fps > 0 else None
 
-        # Update counter
-        count = counter.update(tracked_objects)
-        if count != previous_count:
-            logger.info(f"Frame {frame_id}: Count={count}")
-            previous_count = count
-
-        # Draw separation line
-        cv2.line(frame, p1, p2, (0, 255, 0), 2)
-
-        # Calculate line direction vector for label placement
-        line_vector = (p2[0] - p1[0], p2[1] - p1[1])
-        line_length = (line_vector[0] ** 2 + line_vector[1] ** 2) ** 0.5
-        line_normal = (-line_vector[1] / line_length, line_vector[0] / line_length)
-
-        # Draw in/out labels
-        label_offset = 30
-        in_label_pos = (
-            int((p1[0] + p2[0]) / 2 + line_normal[0] * label_offset),
-            int((p1[1] + p2[1]) / 2 + line_normal[1] * label_offset),
+    num_workers = config["video"].get("num_workers", 1)
+    if num_workers > MAX_DETECTION_WORKERS:
+        logger.warning(
+            f"Limiting detection workers to {MAX_DETECTION_WORKERS} (got {num_workers})"
         )
-        out_label_pos = (
-            int((p1[0] + p2[0]) / 2 - line_normal[0] * label_offset),
-            int((p1[1] + p2[1]) / 2 - line_normal[1] * label_offset),
+        num_workers = MAX_DETECTION_WORKERS
+
+    if num_workers > 1:
+        if config["video"].get("motion_gate", False):
+            logger.warning("The motion gate is not used with detection workers")
+        # Each worker process loads its own detector
+        frame_detections = detect_frames_in_workers(
+            cap, config["detector"], num_workers, realtime_fps
         )
-
-        cv2.putText(
-            frame, "IN", in_label_pos, cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2
+    else:
+        detector = PersonDetector(**config["detector"])
+        # Near-static frames can skip detection; the tracker then keeps
+        # following the previous detections
+        motion_gate = (
+            MotionGate(min_motion_pixels=config["video"].get("motion_min_pixels", 20))
+            if config["video"].get("motion_gate", False)
+            else None
         )
-        cv2.putText(
-            frame, "OUT", out_label_pos, cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2
+        frame_detections = detect_frames_batched(
+            cap,
+            detector,
+            config["video"].get("batch_size", 4),
+            realtime_fps,
+            motion_gate,
         )
 
-        # Draw count
-        cv2.putText(
-            frame,
-            f"Count: {count}",
-            (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (0, 255, 0),
-            2,
-        )
+    with closing(frame_detections):
+        for frame_id, frame, detections in frame_detections:
+            # Keep the tracker's frame count, and so its lost-track timeout,
+            # in step with the video when frames were skipped
+            if frame_id > next_frame_id:
+                tracker.skip_frames(frame_id - next_frame_id)
+            next_frame_id = frame_id + 1
+
+            # Track people
+            tracked_objects = tracker.update(
+                detections,
+                [height, width],
+                (height, width),  # Using original image size
+            )
 
-        # Draw FPS
-        cv2.putText(
-            frame,
-            f"FPS: {display_fps:.1f}",
-            (10, 70),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (0, 255, 0),
-            2,
-        )
+            # Update counter
+            count = counter.update(tracked_objects)
+            if count != previous_count:
+                logger.info(f"Frame {frame_id}: Count={count}")
+                previous_count = count
+                count_text = f"Count: {count}"
 
-        # Draw bounding boxes and track IDs
-        for obj in tracked_objects:
-            bbox = obj["bbox"]
-            x1, y1, x2, y2 = map(int, bbox)
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            # Draw separation line
+            cv2.line(frame, p1, p2, (0, 255, 0), 2)
+
+            # Draw in/out labels
+            cv2.putText(
+                frame,
+                "IN",
+                in_label_pos,
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1,
+                (0, 255, 0),
+                2,
+            )
             cv2.putText(
                 frame,
-                f"ID: {obj['track_id']}",
-                (x1, y1 - 10),
+                "OUT",
+                out_label_pos,
                 cv2.FONT_HERSHEY_SIMPLEX,
-                0.5,
+                1,
                 (0, 255, 0),
                 2,
             )
 
-            # Save results in MOT format
-            results.append(
-                f"{frame_id},{obj['track_id']},{x1:.2f},{y1:.2f},{x2 - x1:.2f},{y2 - y1:.2f},{obj['score']:.2f},-1,-1,-1\n"
+            # Draw count
+            cv2.putText(
+                frame,
+                count_text,
+                (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1,
+                (0, 255, 0),
+                2,
             )
 
-        if config["video"]["save_result"]:
-            vid_writer.write(frame)
-
-        # Resize frame to fit screen while maintaining aspect ratio
-        max_width = config["display"]["max_width"]
-        max_height = config["display"]["max_height"]
-
-        # Calculate scaling factor
-        scale = min(max_width / width, max_height / height)
-        new_width = int(width * scale)
-        new_height = int(height * scale)
-
-        # Resize frame
-        frame = cv2.resize(frame, (new_width, new_height))
-
-        # Display frame
-        cv2.imshow("People Counter", frame)
-
-        # Calculate FPS after complete frame processing
-        frame_end_time = time.time()
-        frame_time = frame_end_time - frame_start_time
-        if frame_time > 0:
-            current_fps = 1.0 / frame_time
-            # Smooth FPS display using exponential moving average
-            if display_fps == 0.0:
-                display_fps = current_fps
-            else:
-                display_fps = 0.9 * display_fps + 0.1 * current_fps
-
-        # Break loop on 'q' key press
-        if cv2.waitKey(1) & 0xFF == ord("q"):
-            break
+            # Draw FPS
+            cv2.putText(
+                frame,
+                f"FPS: {display_fps:.1f}",
+                (10, 70),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1,
+                (0, 255, 0),
+                2,
+            )
 
-        frame_id += 1
+            # Draw bounding boxes and track IDs
+            if tracked_objects:
+                # All boxes go to OpenCV as one array of corner points, so
+                # they are drawn in a single call
+                boxes = np.asarray([obj["bbox"] for obj in tracked_objects])
+                boxes = boxes.astype(np.int32)
+                corners = boxes[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+                cv2.polylines(frame, corners, True, (0, 255, 0), 2)
+
+                for obj, (x1, y1, x2, y2) in zip(tracked_objects, boxes.tolist()):
+                    cv2.putText(
+                        frame,
+                        f"ID: {obj['track_id']}",
+                        (x1, y1 - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX,
+                        0.5,
+                        (0, 255, 0),
+                        2,
+                    )
+
+                    # Save results in MOT format
+                    if config["video"]["save_result"]:
+                        results_file.write(
+                            f"{frame_id},{obj['track_id']},{x1:.2f},{y1:.2f},{x2 - x1:.2f},{y2 - y1:.2f},{obj['score']:.2f},-1,-1,-1\n"
+                        )
+
+            if config["video"]["save_result"]:
+                vid_writer.write(frame)
+
+            if show_display:
+                # Resize frame to fit screen and display it; the resize makes a
+                # new image, so the frame queued for writing is left untouched
+                if display_resize_needed:
+                    frame = cv2.resize(frame, display_size)
+                cv2.imshow("People Counter", frame)
+
+            # Calculate FPS between consecutive displayed frames, so the
+            # batched detection time is spread over the frames it covers
+            frame_end_time = time.time()
+            frame_time = frame_end_time - frame_start_time
+            if frame_time > 0:
+                current_fps = 1.0 / frame_time
+                # Smooth FPS display using exponential moving average
+                if display_fps == 0.0:
+                    display_fps = current_fps
+                else:
+                    display_fps = 0.9 * display_fps + 0.1 * current_fps
+            frame_start_time = frame_end_time
+
+            # Break loop on 'q' key press
+            if show_display and cv2.waitKey(1) & 0xFF == ord("q"):
+                break
 
     # Clean up
     cap.release()
     if config["video"]["save_result"]:
         vid_writer.release()
-    cv2.destroyAllWindows()
+    if show_display:
+        cv2.destroyAllWindows()
 
-    # Save results to file
+    # Close results file
     if config["video"]["save_result"]:
-        results_path = os.path.join(save_folder, "results.txt")
-        with open(results_path, "w") as f:
-            f.writelines(results)
+        results_file.close()
         logger.info(f"Results saved to {results_path}")
 
 
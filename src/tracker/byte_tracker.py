@@ -1,5 +1,5 @@
 from types import SimpleNamespace
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
 
 import numpy as np
 
@@ -39,30 +39,36 @@ class ByteTrack:
         self.frame_id = 0
 
     def update(
-        self, detections: List[Dict], img_info: List[int], img_size: Tuple[int, int]
+        self,
+        detections: Union[List[Dict], np.ndarray],
+        img_info: List[int],
+        img_size: Tuple[int, int],
     ) -> List[Dict]:
         """
         Update tracks with new detections.
 
         Args:
-            detections: List of detection dictionaries
+            detections: List of detection dictionaries, or an (N, 5) array of
+                [x1, y1, x2, y2, confidence] rows
             img_info: List containing [height, width] of the original image
             img_size: Tuple of (target_height, target_width) for model input
 
         Returns:
             List of tracked objects with their IDs and states
         """
-        if not detections:
+        if len(detections) == 0:
             return []
 
-        # Convert detections to ByteTrack format
-        dets = []
-        for det in detections:
-            bbox = det["bbox"]
-            dets.append([bbox[0], bbox[1], bbox[2], bbox[3], det["confidence"]])
-
-        # Convert to numpy array
-        dets = np.array(dets, dtype=np.float32)
+        if isinstance(detections, np.ndarray):
+            # Already in ByteTrack format; copied because ByteTrack rescales
+            # the boxes in place
+            dets = np.array(detections, dtype=np.float32)
+        else:
+            # Convert detections to ByteTrack format, filling each column of a
+            # preallocated array in one assignment
+            dets = np.empty((len(detections), 5), dtype=np.float32)
+            dets[:, :4] = [det["bbox"] for det in detections]
+            dets[:, 4] = [det["confidence"] for det in detections]
 
         # Update tracks
         online_targets = self.tracker.update(dets, img_info, img_size)
@@ -70,14 +76,44 @@ class ByteTrack:
         # Convert tracks to our format
         tracked_objects = []
         for t in online_targets:
+            # tlwh is derived from the Kalman state on every access, so it is
+            # read once and tlbr is built from it the way STrack.tlbr does
+            tlwh = t.tlwh
+            tlbr = tlwh.copy()
+            tlbr[2:] += tlbr[:2]
             tracked_objects.append(
                 {
                     "track_id": t.track_id,
-                    "bbox": t.tlbr,  # top-left, bottom-right format
-                    "tlwh": t.tlwh,  # top-left, width, height format
+                    "bbox": tlbr,  # top-left, bottom-right format
+                    "tlwh": tlwh,  # top-left, width, height format
                     "class_id": t.class_id if hasattr(t, "class_id") else 0,
                     "score": t.score,
                 }
             )
 
         return tracked_objects
+
+    def skip_frames(self, num_frames: int):
+        """
+        Advance the frame count over frames that were not processed.
+
+        Lost tracks then age by the skipped frames too, so track_buffer keeps
+        meaning a number of video frames.
+
+        Args:
+            num_frames: Number of skipped frames
+        """
+        self.tracker.frame_id += num_frames
+
+    def reset(self):
+        """
+        Forget all tracks, keeping the configuration and Kalman filter.
+
+        The track ID counter is global to BaseTrack and left untouched.
+        """
+        self.tracker.tracked_stracks = []
+        self.tracker.lost_stracks = []
+        self.tracker.removed_stracks = []
+        self.tracker.frame_id = 0
+        self.tracked_objects = {}
+        self.frame_id = 0
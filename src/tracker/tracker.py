@@ -1,5 +1,6 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
 
+import numpy as np
 from loguru import logger
 
 from tracker.tracker_factory import TrackerFactory
@@ -21,13 +22,17 @@ class PersonTracker:
         logger.info(f"Tracker initialized: {tracker_type}")
 
     def update(
-        self, detections: List[Dict], img_info: List[int], img_size: Tuple[int, int]
+        self,
+        detections: Union[List[Dict], np.ndarray],
+        img_info: List[int],
+        img_size: Tuple[int, int],
     ) -> List[Dict]:
         """
         Update tracks with new detections.
 
         Args:
-            detections: List of detection dictionaries
+            detections: List of detection dictionaries, or an (N, 5) array of
+                [x1, y1, x2, y2, confidence] rows
             img_info: List containing [height, width] of the original image
             img_size: Tuple of (target_height, target_width) for model input
 
@@ -35,3 +40,21 @@ class PersonTracker:
             List of tracked objects with their IDs and states
         """
         return self.tracker.update(detections, img_info, img_size)
+
+    def skip_frames(self, num_frames: int):
+        """
+        Advance the tracker's frame count over frames that were not processed.
+
+        Args:
+            num_frames: Number of skipped frames
+        """
+        self.tracker.skip_frames(num_frames)
+
+    def reset(self):
+        """
+        Forget all tracks and restart the frame count.
+
+        Track IDs are not reset: they come from a counter shared by all
+        trackers, so new tracks keep getting IDs not used before.
+        """
+        self.tracker.reset()
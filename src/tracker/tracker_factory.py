@@ -28,10 +28,11 @@ class TrackerFactory:
         Raises:
             ValueError: If the tracker type is not supported
         """
-        if tracker_type not in cls._trackers:
+        tracker_class = cls._trackers.get(tracker_type)
+        if tracker_class is None:
             raise ValueError(
                 f"Unsupported tracker type: {tracker_type}. "
                 f"Supported types are: {list(cls._trackers.keys())}"
             )
 
-        return cls._trackers[tracker_type](**kwargs)
+        return tracker_class(**kwargs)
@@ -0,0 +1,19 @@
+"""Scalar reference for the net count change of a batch of line crossings."""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def crossing_delta(prev_sides: np.ndarray, cur_sides: np.ndarray, sign: int) -> int:
+    """
+    Net count change when tracks move from prev_sides to cur_sides.
+
+    Sides are +1 for the "in" side, -1 for the other side and 0 for a track
+    that has no previous position.
+    """
+    delta = 0
+    for i in range(prev_sides.shape[0]):
+        if prev_sides[i] != cur_sides[i] and prev_sides[i] != 0:
+            delta += sign if cur_sides[i] > 0 else -sign
+    return delta
@@ -1,26 +1,27 @@
 import numpy as np
 import pytest
 
+import counter
 from counter import CrossingCriteria, LineCrossingCounter
 
+pytestmark = pytest.mark.xdist_group(name="counter")
 
-# Common fixtures
-@pytest.fixture
-def frame_dimensions():
-    """Standard frame dimensions for testing."""
-    return {"width": 1000, "height": 1000}
+
+# Standard frame dimensions for testing
+FRAME_WIDTH = 1000
+FRAME_HEIGHT = 1000
 
 
 class TestSideCrossing:
     """Tests for side crossing detection with different center criterium."""
 
     @pytest.fixture
-    def diagonal_line_params(self, frame_dimensions):
+    def diagonal_line_params(self):
         """Common parameters for diagonal line counters."""
         return {
             "line_points": ((0.2, 0.2), (0.8, 0.8)),
-            "frame_width": frame_dimensions["width"],
-            "frame_height": frame_dimensions["height"],
+            "frame_width": FRAME_WIDTH,
+            "frame_height": FRAME_HEIGHT,
         }
 
     @pytest.fixture
@@ -85,13 +86,13 @@ class TestDiagonalLineCrossing:
     """Tests for diagonal line crossing detection with different crossing criteria."""
 
     @pytest.fixture
-    def diagonal_line_params(self, frame_dimensions):
+    def diagonal_line_params(self):
         """Common parameters for diagonal line counters."""
         return {
             "line_points": ((0.2, 0.2), (0.8, 0.8)),
             "in_side": "left",
-            "frame_width": frame_dimensions["width"],
-            "frame_height": frame_dimensions["height"],
+            "frame_width": FRAME_WIDTH,
+            "frame_height": FRAME_HEIGHT,
         }
 
     @pytest.fixture
@@ -227,22 +228,20 @@ class TestROIMask:
     """Tests for ROI mask functionality."""
 
     @pytest.fixture
-    def horizontal_line_params(self, frame_dimensions):
+    def horizontal_line_params(self):
         """Horizontal line parameters for ROI testing."""
         return {
             "line_points": ((0.2, 0.5), (0.8, 0.5)),  # Horizontal line across middle
             "in_side": "left",  # Bottom side is "in"
-            "frame_width": frame_dimensions["width"],
-            "frame_height": frame_dimensions["height"],
+            "frame_width": FRAME_WIDTH,
+            "frame_height": FRAME_HEIGHT,
             "crossing_criteria": CrossingCriteria.CENTER,
         }
 
     @pytest.fixture
-    def roi_mask(self, frame_dimensions):
+    def roi_mask(self):
         """Create a rectangular ROI mask in the center of the frame."""
-        mask = np.zeros(
-            (frame_dimensions["height"], frame_dimensions["width"]), dtype=np.uint8
-        )
+        mask = np.zeros((FRAME_HEIGHT, FRAME_WIDTH), dtype=np.uint8)
         # ROI from (250, 200) to (750, 800) - center region for 1000x1000 frame
         mask[200:800, 250:750] = 1
         return mask
@@ -316,3 +315,167 @@ class TestROIMask:
         # Should not count the crossing since both positions are outside ROI
         expected_counts = [0, 0]  # no crossing detected
         assert counts == expected_counts
+
+    def test_update_batch_with_roi(
+        self,
+        horizontal_line_params,
+        roi_mask,
+        movement_objects_in_roi,
+        movement_objects_outside_roi,
+    ):
+        """Test that the array interface only counts the crossing inside the ROI."""
+        counter = LineCrossingCounter(**horizontal_line_params, roi_mask=roi_mask)
+
+        # Track 1 moves inside the ROI, track 2 outside it, in the same frames
+        counts = []
+        for inside, outside in zip(
+            movement_objects_in_roi, movement_objects_outside_roi
+        ):
+            bboxes = np.array([inside["bbox"], outside["bbox"]], dtype=np.float32)
+            counts.append(counter.update_batch(bboxes, np.array([1, 2])))
+
+        assert counts == [0, -1]
+
+
+class TestMultipleTracks:
+    """Tests for several tracked objects updated in the same frame."""
+
+    @pytest.fixture
+    def vertical_line_counter(self):
+        """Vertical line through the middle of the frame, left side is "in"."""
+        return LineCrossingCounter(
+            line_points=((0.5, 0.0), (0.5, 1.0)),
+            in_side="left",
+            frame_width=FRAME_WIDTH,
+            frame_height=FRAME_HEIGHT,
+            crossing_criteria=CrossingCriteria.CENTER,
+        )
+
+    @pytest.fixture
+    def multi_track_frames(self):
+        """Two frames where three tracks cross the line in both directions."""
+        return [
+            [
+                {"track_id": 1, "bbox": [650, 400, 750, 500]},  # center x=0.7, out
+                {"track_id": 2, "bbox": [250, 400, 350, 500]},  # center x=0.3, in
+                {"track_id": 3, "bbox": [750, 600, 850, 700]},  # center x=0.8, out
+            ],
+            [
+                {"track_id": 3, "bbox": [150, 600, 250, 700]},  # OUT -> IN
+                {"track_id": 1, "bbox": [250, 400, 350, 500]},  # OUT -> IN
+                {"track_id": 2, "bbox": [650, 400, 750, 500]},  # IN -> OUT
+                {"track_id": 4, "bbox": [150, 100, 250, 200]},  # new track
+            ],
+        ]
+
+    def test_multiple_tracks_in_one_update(
+        self, vertical_line_counter, multi_track_frames
+    ):
+        """Test that crossings of all objects in a frame are counted."""
+        counts = [vertical_line_counter.update(objs) for objs in multi_track_frames]
+
+        expected_counts = [0, 1]  # +1 +1 -1 in the second frame
+        assert counts == expected_counts
+
+    def test_update_batch_matches_update(
+        self, vertical_line_counter, multi_track_frames
+    ):
+        """Test that the array interface counts like the dict interface."""
+        batch_counter = LineCrossingCounter(
+            line_points=((0.5, 0.0), (0.5, 1.0)),
+            in_side="left",
+            frame_width=FRAME_WIDTH,
+            frame_height=FRAME_HEIGHT,
+            crossing_criteria=CrossingCriteria.CENTER,
+        )
+
+        for objs in multi_track_frames:
+            bboxes = np.array([obj["bbox"] for obj in objs], dtype=np.float64)
+            track_ids = np.array([obj["track_id"] for obj in objs])
+            assert batch_counter.update_batch(
+                bboxes, track_ids
+            ) == vertical_line_counter.update(objs)
+
+    def test_matches_one_object_per_update(
+        self, vertical_line_counter, multi_track_frames
+    ):
+        """Test that a whole-frame update matches feeding objects one at a time."""
+        single_counter = LineCrossingCounter(
+            line_points=((0.5, 0.0), (0.5, 1.0)),
+            in_side="left",
+            frame_width=FRAME_WIDTH,
+            frame_height=FRAME_HEIGHT,
+            crossing_criteria=CrossingCriteria.CENTER,
+        )
+
+        for objs in multi_track_frames:
+            batch_count = vertical_line_counter.update(objs)
+            for obj in objs:
+                single_count = single_counter.update([obj])
+            assert batch_count == single_count
+
+    def test_numpy_path_matches_numba_kernel(self, monkeypatch, multi_track_frames):
+        """Test that the NumPy fallback gives the same counts as the numba kernel."""
+        pytest.importorskip("numba")
+        roi_mask = np.zeros((FRAME_HEIGHT, FRAME_WIDTH), dtype=np.uint8)
+        roi_mask[:, 300:] = 1
+        params = {
+            "line_points": ((0.5, 0.0), (0.5, 1.0)),
+            "in_side": "left",
+            "frame_width": FRAME_WIDTH,
+            "frame_height": FRAME_HEIGHT,
+            "roi_mask": roi_mask,
+        }
+
+        kernel_counter = LineCrossingCounter(**params)
+        kernel_counts = [kernel_counter.update(objs) for objs in multi_track_frames]
+
+        monkeypatch.setattr(counter, "_crossing_changes_kernel", None)
+        numpy_counter = LineCrossingCounter(**params)
+        numpy_counts = [numpy_counter.update(objs) for objs in multi_track_frames]
+
+        assert numpy_counts == kernel_counts == [0, 0]  # track 3 ends outside ROI
+
+    def test_empty_update_keeps_count(self, vertical_line_counter):
+        """Test that a frame without tracked objects leaves the count unchanged."""
+        assert vertical_line_counter.update([]) == 0
+
+    def test_counter_many_tracks(self, vertical_line_counter):
+        """Test that thousands of sparse track IDs grow the per-track state."""
+        track_ids = np.arange(0, 100_000, 10)
+        out_bboxes = np.tile([650.0, 400.0, 750.0, 500.0], (len(track_ids), 1))
+        in_bboxes = np.tile([250.0, 400.0, 350.0, 500.0], (len(track_ids), 1))
+
+        assert vertical_line_counter.update_batch(out_bboxes, track_ids) == 0
+        # Every other track crosses into the left side, the rest stay out
+        in_bboxes[1::2] = out_bboxes[1::2]
+        count = vertical_line_counter.update_batch(in_bboxes, track_ids)
+
+        assert count == len(track_ids) // 2
+        assert len(vertical_line_counter.tracked_positions) == len(track_ids)
+
+    def test_matches_scalar_oracle(self, vertical_line_counter):
+        """Test random side changes against a scalar reference of the count."""
+        pytest.importorskip("numba")
+        from tests._numba_oracle import crossing_delta
+
+        rng = np.random.default_rng(0)
+        prev_sides = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=1000)
+        cur_sides = rng.choice(np.array([-1, 1], dtype=np.int8), size=1000)
+        track_ids = np.arange(len(prev_sides))
+
+        # Centers at x=0.3 are on the "in" (left) side, at x=0.7 outside it
+        def bboxes_for(sides):
+            centers_x = np.where(sides > 0, 300.0, 700.0)
+            bboxes = np.tile([0.0, 400.0, 0.0, 500.0], (len(sides), 1))
+            bboxes[:, 0] = centers_x - 50
+            bboxes[:, 2] = centers_x + 50
+            return bboxes
+
+        seen = prev_sides != 0
+        vertical_line_counter.update_batch(
+            bboxes_for(prev_sides[seen]), track_ids[seen]
+        )
+        count = vertical_line_counter.update_batch(bboxes_for(cur_sides), track_ids)
+
+        assert count == crossing_delta(prev_sides, cur_sides, 1)
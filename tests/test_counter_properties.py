@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from hypothesis import assume, given, settings
+from hypothesis import strategies as st
+from hypothesis.extra.numpy import arrays
+
+from counter import CrossingCriteria, LineCrossingCounter
+
+pytestmark = pytest.mark.xdist_group(name="counter")
+
+FRAME_WIDTH = 1000
+FRAME_HEIGHT = 1000
+
+normalized_points = st.tuples(st.floats(0, 1), st.floats(0, 1))
+
+
+def split_into_frames(track_ids: np.ndarray):
+    """Split rows into consecutive frames in which every track ID is unique."""
+    frames, start, seen = [], 0, set()
+    for i, track_id in enumerate(track_ids.tolist()):
+        if track_id in seen:
+            frames.append(slice(start, i))
+            start, seen = i, set()
+        seen.add(track_id)
+    frames.append(slice(start, len(track_ids)))
+    return frames
+
+
+def reference_point(bbox, crossing_criteria):
+    """Normalized reference point of a bbox, computed one object at a time."""
+    x_min, y_min, x_max, y_max = bbox
+    center_x = (x_min + x_max) / 2 / FRAME_WIDTH
+    center_y = (y_min + y_max) / 2 / FRAME_HEIGHT
+    return {
+        CrossingCriteria.CENTER: (center_x, center_y),
+        CrossingCriteria.TOP: (center_x, y_min / FRAME_HEIGHT),
+        CrossingCriteria.BOTTOM: (center_x, y_max / FRAME_HEIGHT),
+        CrossingCriteria.LEFT: (x_min / FRAME_WIDTH, center_y),
+        CrossingCriteria.RIGHT: (x_max / FRAME_WIDTH, center_y),
+    }[crossing_criteria]
+
+
+class ScalarCounter:
+    """Per-object reference of the line crossing count, without NumPy."""
+
+    def __init__(self, line_points, in_side, crossing_criteria):
+        p1, p2 = line_points
+        self.line_points = (p1, p2) if p1[1] <= p2[1] else (p2, p1)
+        self.in_side = in_side
+        self.crossing_criteria = crossing_criteria
+        self.tracked_positions = {}
+        self.count = 0
+
+    def is_on_in_side(self, point):
+        x, y = point
+        (x1, y1), (x2, y2) = self.line_points
+        cross_product = (x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)
+        return (cross_product > 0) == (self.in_side == "left")
+
+    def update(self, track_id, bbox):
+        current = reference_point(bbox, self.crossing_criteria)
+        if track_id in self.tracked_positions:
+            was_in = self.is_on_in_side(self.tracked_positions[track_id])
+            is_in = self.is_on_in_side(current)
+            if was_in != is_in:
+                self.count += 1 if is_in else -1
+        self.tracked_positions[track_id] = current
+        return self.count
+
+
+@settings(deadline=None)
+@given(
+    rows=arrays(
+        np.float32,
+        st.tuples(st.integers(1, 128), st.just(5)),
+        elements=st.floats(0, 1000, width=32),
+    ),
+    line_points=st.tuples(normalized_points, normalized_points),
+    in_side=st.sampled_from(["left", "right"]),
+    crossing_criteria=st.sampled_from(list(CrossingCriteria)),
+)
+def test_batch_matches_scalar(rows, line_points, in_side, crossing_criteria):
+    """Test that whole-frame updates count like a per-object reference.
+
+    Each row is [x1, y1, x2, y2, t]; t // 100 gives one of ten track IDs, so
+    tracks move and cross the line many times over the rows.
+    """
+    assume(line_points[0] != line_points[1])
+    batch_counter = LineCrossingCounter(
+        line_points=line_points,
+        in_side=in_side,
+        frame_width=FRAME_WIDTH,
+        frame_height=FRAME_HEIGHT,
+        crossing_criteria=crossing_criteria,
+    )
+    scalar_counter = ScalarCounter(line_points, in_side, crossing_criteria)
+
+    bboxes = rows[:, :4]
+    track_ids = (rows[:, 4] // 100).astype(np.intp)
+    for frame in split_into_frames(track_ids):
+        batch_count = batch_counter.update_batch(bboxes[frame], track_ids[frame])
+        for bbox, track_id in zip(bboxes[frame].tolist(), track_ids[frame].tolist()):
+            scalar_count = scalar_counter.update(track_id, bbox)
+        assert batch_count == scalar_count
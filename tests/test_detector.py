@@ -1,19 +1,62 @@
+import shutil
+
 import numpy as np
 import pytest
+import torch
+from ultralytics import YOLO
 
+import detectors.yolo_detector
 from detectors import PersonDetector
 from detectors.yolo_detector import YoloDetector
 
+# One xdist worker runs this file, so the YOLO weights load once per run
+pytestmark = pytest.mark.xdist_group(name="detector")
+
+
+@pytest.fixture(scope="module")
+def load_yolo():
+    # Loader for detectors built in this module: the same weights on the same
+    # device load once, and the cache is dropped with the module
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    models = {}
+
+    def load(model_path):
+        key = (model_path, device)
+        if key not in models:
+            models[key] = YOLO(model_path)
+        return models[key]
+
+    return load
+
+
+def build_yolo_detector(load_yolo, **kwargs):
+    """Build a YoloDetector whose weights come from load_yolo."""
+    # Patched only while constructing, so other detectors load their own model
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(detectors.yolo_detector, "YOLO", load_yolo)
+        return YoloDetector(**kwargs)
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def sample_frame():
-    # Create a sample frame (black image)
-    return np.zeros((480, 640, 3), dtype=np.uint8)
+    # Create a sample frame (black image), shared and read-only
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    frame.setflags(write=False)
+    return frame
+
 
+@pytest.fixture(scope="session")
+def small_sample_frame():
+    frame = np.zeros((320, 320, 3), dtype=np.uint8)
+    frame.setflags(write=False)
+    return frame
 
-@pytest.fixture
-def yolo_detector():
-    return YoloDetector(
+
+@pytest.fixture(scope="module")
+def yolo_detector(load_yolo):
+    # Loading the weights dominates the test time; tests only read the detector
+    return build_yolo_detector(
+        load_yolo,
         model_path="models/yolov8s.pt",
         class_id=0,
         conf_threshold=0.25,
@@ -22,6 +65,17 @@ def yolo_detector():
     )
 
 
+@pytest.fixture(scope="module")
+def small_yolo_detector(load_yolo):
+    return build_yolo_detector(
+        load_yolo,
+        model_path="models/yolov8n.pt",
+        conf_threshold=0.5,
+        input_height=320,
+        input_width=320,
+    )
+
+
 class TestYoloDetector:
     def test_initialization(self, yolo_detector):
         assert yolo_detector.conf_threshold == 0.25
@@ -36,16 +90,21 @@ class TestYoloDetector:
         # Empty frame should have no detections
         assert len(detections) == 0
 
-    def test_detect_with_different_input_size(self):
+    def test_detect_batch_matches_detect(self, yolo_detector, sample_frame):
+        frames = [sample_frame, sample_frame.copy()]
+        batch_detections = yolo_detector.detect_batch(frames)
+        assert len(batch_detections) == len(frames)
+        for frame, detections in zip(frames, batch_detections):
+            assert detections == yolo_detector.detect(frame)
+
+    def test_detect_batch_empty(self, yolo_detector):
+        assert yolo_detector.detect_batch([]) == []
+
+    def test_detect_with_different_input_size(
+        self, small_yolo_detector, small_sample_frame
+    ):
         # Test with different input sizes
-        detector = YoloDetector(
-            model_path="models/yolov8n.pt",
-            conf_threshold=0.5,
-            input_height=320,
-            input_width=320,
-        )
-        frame = np.zeros((320, 320, 3), dtype=np.uint8)
-        detections = detector.detect(frame)
+        detections = small_yolo_detector.detect(small_sample_frame)
         assert isinstance(detections, list)
 
 
@@ -61,6 +120,27 @@ class TestPersonDetector:
         )
         assert isinstance(detector.detector, YoloDetector)
 
+    def test_factory_creation_onnx(self, sample_frame, tmp_path):
+        pytest.importorskip("onnxruntime")
+        from detectors.onnx_detector import OnnxDetector
+
+        # The ONNX model is exported next to the weights, so export from a
+        # copy in tmp_path to keep it out of the repository
+        YOLO("models/yolov8n.pt")  # downloads the weights if missing
+        weights = tmp_path / "yolov8n.pt"
+        shutil.copy("models/yolov8n.pt", weights)
+
+        detector = PersonDetector(
+            detector_type="onnx",
+            model_path=str(weights),
+            conf_threshold=0.5,
+            input_height=640,
+            input_width=640,
+            class_id=0,
+        )
+        assert isinstance(detector.detector, OnnxDetector)
+        assert detector.detect(sample_frame) == []
+
     def test_invalid_detector_type(self):
         with pytest.raises(ValueError):
             PersonDetector(detector_type="invalid_type")
@@ -1,9 +1,12 @@
+import numpy as np
 import pytest
 
 from tracker import PersonTracker
 
+pytestmark = pytest.mark.xdist_group(name="tracker")
 
-@pytest.fixture
+
+@pytest.fixture(scope="class")
 def tracker():
     return PersonTracker(
         tracker_type="bytetrack",
@@ -54,6 +57,11 @@ def occluded_detections():
 
 
 class TestPersonTracker:
+    @pytest.fixture(autouse=True)
+    def reset_tracker(self, tracker):
+        """Start every test from a tracker without tracks."""
+        tracker.reset()
+
     def test_initialization(self, tracker):
         assert tracker.tracker.track_thresh == 0.5
         assert tracker.tracker.track_buffer == 30
@@ -103,6 +111,36 @@ class TestPersonTracker:
         track_ids = {obj[0]["track_id"] for obj in tracked_objects if obj}
         assert len(track_ids) == 1  # Should be tracking the same object
 
+    def test_update_with_detection_array(self, tracker, moving_detections):
+        # Rows of [x1, y1, x2, y2, confidence], one frame per update
+        array_tracker = PersonTracker(
+            tracker_type="bytetrack",
+            track_thresh=0.5,
+            track_buffer=30,
+            match_thresh=0.8,
+            frame_rate=30,
+        )
+        track_ids = set()
+        for det in moving_detections:
+            detections_array = np.array(
+                [[*det["bbox"], det["confidence"]]], dtype=np.float32
+            )
+            expected = tracker.update([det], [480, 640], (480, 640))
+            tracked = array_tracker.update(detections_array, [480, 640], (480, 640))
+
+            # Track IDs come from a counter shared by all trackers, so only
+            # the boxes are compared across the two
+            assert len(tracked) == len(expected)
+            for obj, expected_obj in zip(tracked, expected):
+                np.testing.assert_allclose(obj["bbox"], expected_obj["bbox"])
+            track_ids.update(obj["track_id"] for obj in tracked)
+
+        assert len(track_ids) == 1
+
+    def test_update_with_empty_detection_array(self, tracker):
+        empty = np.empty((0, 5), dtype=np.float32)
+        assert tracker.update(empty, [480, 640], (480, 640)) == []
+
     def test_track_multiple_objects(self, tracker):
         # Test tracking multiple objects with different confidences
         detections1 = [
@@ -126,3 +164,26 @@ class TestPersonTracker:
         track_ids1 = {obj["track_id"] for obj in tracked1}
         track_ids2 = {obj["track_id"] for obj in tracked2}
         assert track_ids1 == track_ids2
+
+    def test_skip_frames_expires_lost_tracks(self, tracker):
+        person = {"bbox": [100, 100, 200, 200], "confidence": 0.9}
+        other = {"bbox": [400, 300, 500, 400], "confidence": 0.9}
+
+        tracker.update([person], [480, 640], (480, 640))
+        track_id = tracker.update([person], [480, 640], (480, 640))[0]["track_id"]
+
+        # The person disappears, then more frames than track_buffer are skipped
+        tracker.update([other], [480, 640], (480, 640))
+        tracker.skip_frames(31)
+        tracker.update([other], [480, 640], (480, 640))
+        tracker.update([other], [480, 640], (480, 640))
+
+        tracked = tracker.update([person, other], [480, 640], (480, 640))
+        assert track_id not in {obj["track_id"] for obj in tracked}
+
+    def test_reset_forgets_tracks(self, tracker, sample_detections):
+        tracker.update(sample_detections, [480, 640], (480, 640))
+        tracker.reset()
+
+        assert tracker.tracker.tracker.tracked_stracks == []
+        assert tracker.tracker.tracker.frame_id == 0
@@ -0,0 +1,39 @@
+import os
+
+import numpy as np
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from app.core.line_manager import LineManager
+from app.core.roi_manager import ROIManager
+from app.ui.video_display import VideoDisplayWidget
+from app.utils.coordinate_utils import CoordinateTransformer
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    # Headless runs have no display to connect to
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def display(qapp):
+    transformer = CoordinateTransformer(640, 480)
+    return VideoDisplayWidget(LineManager(transformer), ROIManager(transformer))
+
+
+@pytest.fixture
+def frame():
+    return np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+class TestVideoDisplay:
+    def test_playback_frame_is_not_copied(self, display, frame):
+        display.update_frame(frame)
+        assert display.current_frame is frame
+
+    def test_original_frame_is_copied(self, display, frame):
+        display.update_frame(frame, is_original=True)
+        assert not np.shares_memory(display.original_frame, frame)
+        assert not display.original_frame.flags.writeable